@@ -8,6 +8,77 @@ import sys
 import shutil
 from pathlib import Path
 
+# PlantUML patterns used by convert_plantuml_to_mermaid, compiled once
+_RE_TITLE = re.compile(r'title\s+(.*?)$', re.MULTILINE)
+
+# Sequence diagram rewrites as (name, pattern, replacement), applied in a
+# single pass; at each position the first matching rule wins
+_SEQUENCE_RULES = (
+    ('title', r'title\s+.*?\n', ''),
+    ('participant_alias', r'participant\s+"([^"]+)"\s+as\s+(\w+)', '    participant {1} as "{0}"'),
+    ('actor_alias', r'actor\s+"([^"]+)"\s+as\s+(\w+)', '    actor {1} as "{0}"'),
+    ('database_alias', r'database\s+"([^"]+)"\s+as\s+(\w+)', '    participant {1} as "{0}"'),
+    ('participant', r'participant\s+(\w+)\s*$', '    participant {0}'),
+    ('actor', r'actor\s+(\w+)\s*$', '    actor {0}'),
+    ('database', r'database\s+(\w+)\s*$', '    participant {0}'),
+    ('arrow', r'(\w+)\s*(-?->)\s*(\w+)\s*:\s*(.*?)$', '    {0}{1}>{2}: {3}'),
+    ('deactivate', r'deactivate\s+(\w+)', '    deactivate {0}'),
+    ('activate', r'activate\s+(\w+)', '    activate {0}'),
+    ('note', r'note\s+(?:left|right)\s+of\s+(\w+)\s*:\s*(.*?)$', '    Note {0}: {1}'),
+)
+_RE_SEQUENCE = re.compile(
+    '|'.join(f'(?P<{name}>{pattern})' for name, pattern, _ in _SEQUENCE_RULES),
+    re.MULTILINE
+)
+
+# Replacement and group count of each sequence rule
+_SEQUENCE_REPLACEMENTS = {
+    name: (replacement, re.compile(pattern).groups)
+    for name, pattern, replacement in _SEQUENCE_RULES
+}
+
+# Class diagram patterns
+_RE_CLASS = re.compile(r'class\s+(\w+)(?:\s*{([^}]*)})?')
+_RE_INHERITANCE = re.compile(r'(\w+)\s+<\|\-\-\s+(\w+)')
+_RE_COMPOSITION = re.compile(r'(\w+)\s+\*\-\-\s+(\w+)')
+_RE_AGGREGATION = re.compile(r'(\w+)\s+o\-\-\s+(\w+)')
+_RE_ASSOCIATION_LABEL = re.compile(r'(\w+)\s+\-\-\s+(\w+)\s*:\s*(.*?)$', re.MULTILINE)
+_RE_ASSOCIATION = re.compile(r'(\w+)\s+\-\-\s+(\w+)')
+
+# Component diagram patterns
+_RE_COMPONENT = re.compile(r'\[([^\]]+)\]')
+_RE_INTERFACE = re.compile(r'\(\)\s*"([^"]+)"')
+_RE_COMPONENT_DATABASE = re.compile(r'database\s*"([^"]+)"')
+_RE_PACKAGE_START = re.compile(r'package\s*"([^"]+)"\s*{')
+_RE_PACKAGE_END = re.compile(r'}')
+_RE_FLOW = re.compile(r'(\w+)\s*-+>\s*(\w+)')
+_RE_FLOW_LABEL = re.compile(r'(\w+)\s*-+>\s*(\w+)\s*:\s*([^\n]+)')
+
+def _strip_marker_line(content, marker):
+    """
+    Remove the first marker and the rest of its line, up to and including
+    the newline
+    """
+    start = content.find(marker)
+    if start == -1:
+        return content
+    
+    end = content.find('\n', start)
+    if end == -1:
+        return content
+    
+    return content[:start] + content[end + 1:]
+
+def _convert_sequence_match(match):
+    """
+    Rewrite one PlantUML sequence diagram construct matched by _RE_SEQUENCE
+    """
+    replacement, group_count = _SEQUENCE_REPLACEMENTS[match.lastgroup]
+    
+    # The rule's own groups follow its named group, which closes last
+    start = match.lastindex
+    return replacement.format(*match.groups()[start:start + group_count])
+
 # Function to convert PlantUML to Mermaid (copied from convert_plantuml_to_mermaid.py)
 def convert_plantuml_to_mermaid(content):
     """
@@ -30,49 +101,21 @@ def convert_plantuml_to_mermaid(content):
         diagram_type = "sequence"  # Default to sequence diagram
     
     # Remove @startuml and @enduml tags
-    content = re.sub(r'@startuml.*?\n', '', content)
-    content = re.sub(r'@enduml.*?\n', '', content)
+    content = _strip_marker_line(content, '@startuml')
+    content = _strip_marker_line(content, '@enduml')
     
     if diagram_type == "sequence":
         # Convert title
-        title_match = re.search(r'title\s+(.*?)$', content, re.MULTILINE)
+        title_match = _RE_TITLE.search(content)
         if title_match:
             title = title_match.group(1)
-            content = re.sub(r'title\s+.*?\n', '', content)
             mermaid_title = f"sequenceDiagram\n    title: {title}\n"
         else:
             mermaid_title = "sequenceDiagram\n"
         
-        # Convert participants
-        participant_pattern = r'participant\s+"([^"]+)"\s+as\s+(\w+)'
-        actor_pattern = r'actor\s+"([^"]+)"\s+as\s+(\w+)'
-        database_pattern = r'database\s+"([^"]+)"\s+as\s+(\w+)'
-        
-        def convert_participant_line(match):
-            name = match.group(1)
-            alias = match.group(2)
-            return f"    participant {alias} as \"{name}\""
-        
-        content = re.sub(participant_pattern, convert_participant_line, content)
-        content = re.sub(actor_pattern, lambda m: f"    actor {m.group(2)} as \"{m.group(1)}\"", content)
-        content = re.sub(database_pattern, lambda m: f"    participant {m.group(2)} as \"{m.group(1)}\"", content)
-        
-        # Simple participants without quotes or aliases
-        content = re.sub(r'participant\s+(\w+)\s*$', r'    participant \1', content, flags=re.MULTILINE)
-        content = re.sub(r'actor\s+(\w+)\s*$', r'    actor \1', content, flags=re.MULTILINE)
-        content = re.sub(r'database\s+(\w+)\s*$', r'    participant \1', content, flags=re.MULTILINE)
-        
-        # Convert arrows
-        content = re.sub(r'(\w+)\s*->\s*(\w+)\s*:\s*(.*?)$', r'    \1->>\2: \3', content, flags=re.MULTILINE)
-        content = re.sub(r'(\w+)\s*-->\s*(\w+)\s*:\s*(.*?)$', r'    \1-->>\2: \3', content, flags=re.MULTILINE)
-        
-        # Handle activation/deactivation
-        content = re.sub(r'activate\s+(\w+)', r'    activate \1', content)
-        content = re.sub(r'deactivate\s+(\w+)', r'    deactivate \1', content)
-        
-        # Handle notes
-        content = re.sub(r'note\s+(?:left|right)\s+of\s+(\w+)\s*:\s*(.*?)$', 
-                         r'    Note \1: \2', content, flags=re.MULTILINE)
+        # Remove title lines and convert participants, arrows, activations
+        # and notes in one pass
+        content = _RE_SEQUENCE.sub(_convert_sequence_match, content)
         
         return mermaid_title + content.strip()
     
@@ -81,8 +124,6 @@ def convert_plantuml_to_mermaid(content):
         mermaid_content = "classDiagram\n"
         
         # Convert class definitions
-        class_pattern = r'class\s+(\w+)(?:\s*{([^}]*)})?'
-        
         def convert_class(match):
             class_name = match.group(1)
             members = match.group(2) if match.group(2) else ""
@@ -111,23 +152,23 @@ def convert_plantuml_to_mermaid(content):
             else:
                 return f"class {class_name}"
         
-        content = re.sub(class_pattern, convert_class, content)
+        content = _RE_CLASS.sub(convert_class, content)
         
         # Convert relationships
         # Inheritance
-        content = re.sub(r'(\w+)\s+<\|\-\-\s+(\w+)', r'    \2 --|> \1', content)
+        content = _RE_INHERITANCE.sub(r'    \2 --|> \1', content)
         
         # Composition
-        content = re.sub(r'(\w+)\s+\*\-\-\s+(\w+)', r'    \1 *-- \2', content)
+        content = _RE_COMPOSITION.sub(r'    \1 *-- \2', content)
         
         # Aggregation
-        content = re.sub(r'(\w+)\s+o\-\-\s+(\w+)', r'    \1 o-- \2', content)
+        content = _RE_AGGREGATION.sub(r'    \1 o-- \2', content)
         
         # Association with label
-        content = re.sub(r'(\w+)\s+\-\-\s+(\w+)\s*:\s*(.*?)$', r'    \1 -- \2 : \3', content, flags=re.MULTILINE)
+        content = _RE_ASSOCIATION_LABEL.sub(r'    \1 -- \2 : \3', content)
         
         # Simple association
-        content = re.sub(r'(\w+)\s+\-\-\s+(\w+)', r'    \1 -- \2', content)
+        content = _RE_ASSOCIATION.sub(r'    \1 -- \2', content)
         
         return mermaid_content + content.strip()
     
@@ -136,33 +177,27 @@ def convert_plantuml_to_mermaid(content):
         mermaid_content = "graph TD\n"
         
         # Convert components
-        component_pattern = r'\[([^\]]+)\]'
-        content = re.sub(component_pattern, r'    \1[\1]', content)
+        content = _RE_COMPONENT.sub(r'    \1[\1]', content)
         
         # Convert interfaces
-        interface_pattern = r'\(\)\s*"([^"]+)"'
-        content = re.sub(interface_pattern, r'    \1((\1))', content)
+        content = _RE_INTERFACE.sub(r'    \1((\1))', content)
         
         # Convert databases
-        database_pattern = r'database\s*"([^"]+)"'
-        content = re.sub(database_pattern, r'    \1[(\1)]', content)
+        content = _RE_COMPONENT_DATABASE.sub(r'    \1[(\1)]', content)
         
         # Convert packages
-        package_start_pattern = r'package\s*"([^"]+)"\s*{'
-        package_end_pattern = r'}'
-        
         def convert_package(match):
             package_name = match.group(1)
             return f"    subgraph \"{package_name}\""
         
-        content = re.sub(package_start_pattern, convert_package, content)
-        content = re.sub(package_end_pattern, r'    end', content)
+        content = _RE_PACKAGE_START.sub(convert_package, content)
+        content = _RE_PACKAGE_END.sub(r'    end', content)
         
         # Convert relationships
-        content = re.sub(r'(\w+)\s*-+>\s*(\w+)', r'    \1 --> \2', content)
+        content = _RE_FLOW.sub(r'    \1 --> \2', content)
         
         # Convert labels
-        content = re.sub(r'(\w+)\s*-+>\s*(\w+)\s*:\s*([^\n]+)', r'    \1 -->|\3| \2', content)
+        content = _RE_FLOW_LABEL.sub(r'    \1 -->|\3| \2', content)
         
         return mermaid_content + content.strip()
     
@@ -0,0 +1,61 @@
+"""
+PlantUML text encoding for PyDiagrams.
+
+This module encodes PlantUML sources for the diagram URLs of a PlantUML
+server, and is shared by the PlantUML parser and renderer.
+"""
+
+import base64
+import zlib
+from functools import lru_cache
+from typing import Union
+
+# PlantUML's base64 variant keeps the usual bit grouping but uses its own
+# alphabet, so standard base64 output is translated character by character
+_BASE64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+_PLANTUML_ALPHABET = b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_"
+_PLANTUML_TRANS = bytes.maketrans(_BASE64_ALPHABET, _PLANTUML_ALPHABET)
+
+# Sources at least this long are encoded without being kept in the cache
+_MAX_CACHED_SOURCE_LENGTH = 1_000_000
+
+
+@lru_cache(maxsize=256)
+def _encode_plantuml_cached(text: Union[str, bytes]) -> str:
+    """
+    Encode PlantUML text for the PlantUML server, memoized by source.
+
+    Args:
+        text: PlantUML text, or its UTF-8 encoding
+
+    Returns:
+        Encoded string for URL
+    """
+    # Compress the UTF-8 text as raw DEFLATE, without the zlib header
+    data = text if isinstance(text, bytes) else text.encode('utf-8')
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+    deflated = compressor.compress(data) + compressor.flush()
+
+    # Convert to PlantUML's base64 alphabet; it has no padding character
+    return base64.b64encode(deflated).rstrip(b'=').translate(_PLANTUML_TRANS).decode('ascii')
+
+
+def encode_plantuml(text: Union[str, bytes]) -> str:
+    """
+    Encode PlantUML text for use in PlantUML server URLs.
+
+    This is the server's default text encoding (raw DEFLATE in PlantUML's
+    base64 alphabet), so the result is used without a prefix, as in
+    ``{server}/svg/{encoded}``.
+
+    Args:
+        text: PlantUML text, or its UTF-8 encoding
+
+    Returns:
+        Encoded string for URL
+    """
+    # Repeated renders of the same source reuse its encoding; very
+    # large sources bypass the cache to bound its memory
+    if len(text) < _MAX_CACHED_SOURCE_LENGTH:
+        return _encode_plantuml_cached(text)
+    return _encode_plantuml_cached.__wrapped__(text)
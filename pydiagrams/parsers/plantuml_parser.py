@@ -5,13 +5,11 @@ This module provides a parser for PlantUML syntax to convert it to PyDiagrams in
 It also includes functionality to generate diagrams using the PlantUML server.
 """
 
-import base64
 import re
-import zlib
 from typing import Dict, Any, List, Tuple, Optional
-import requests
 
 from pydiagrams.parsers.base_parser import BaseParser
+from pydiagrams.parsers.plantuml_encoding import encode_plantuml
 
 
 class PlantUMLParser(BaseParser):
@@ -716,10 +714,14 @@ class PlantUMLParser(BaseParser):
         Returns:
             Content in the specified format
         """
+        # Import requests only when a diagram is actually fetched, since it
+        # dominates the import time of the package
+        import requests
+        
         plantuml_url = f"{self.PLANTUML_SERVER}/{format_type}"
         
         # Encode the PlantUML content
-        encoded = self._encode_plantuml(content)
+        encoded = encode_plantuml(content)
         url = f"{plantuml_url}/{encoded}"
         
         try:
@@ -728,25 +730,3 @@ class PlantUMLParser(BaseParser):
             return response.content
         except requests.RequestException as e:
             raise RuntimeError(f"Error generating diagram from PlantUML server: {e}")
-
-    @staticmethod
-    def _encode_plantuml(text: str) -> str:
-        """
-        Encode PlantUML text for use with the PlantUML server.
-
-        Args:
-            text: PlantUML text
-
-        Returns:
-            Encoded string for URL
-        """
-        # Add the ~1 prefix to indicate DEFLATE encoding
-        # Convert to UTF-8 and compress with zlib
-        zlibbed = zlib.compress(text.encode('utf-8'))
-        
-        # Convert to base64 and replace unsafe characters
-        compressed = base64.b64encode(zlibbed).decode('ascii')
-        compressed = compressed.replace('+', '-').replace('/', '_')
-        
-        # Add ~1 prefix to indicate DEFLATE encoding
-        return f"~1{compressed}" 
\ No newline at end of file
@@ -244,35 +244,31 @@ class CodeRenderer:
             interfaces_str = ", ".join(class_obj.interfaces)
             label += f'<TR><TD ALIGN="LEFT" PORT="interfaces">implements {interfaces_str}</TD></TR>'
         
-        # Attribute section
-        has_attributes = False
-        attribute_rows = ""
+        # Attribute section, collected as a list of rows and joined once
+        attribute_rows = []
         
         # Find all variables that are children of this class
         for variable in self.diagram.variables:
             if variable in class_obj.children:
-                has_attributes = True
                 var_signature = self._format_variable_signature(variable)
-                attribute_rows += f'<TR><TD ALIGN="LEFT" PORT="{variable.id}">{var_signature}</TD></TR>'
+                attribute_rows.append(f'<TR><TD ALIGN="LEFT" PORT="{variable.id}">{var_signature}</TD></TR>')
         
-        if has_attributes:
+        if attribute_rows:
             label += f'<TR><TD BGCOLOR="#E5E9F0" COLSPAN="1"><I>Attributes</I></TD></TR>'
-            label += attribute_rows
+            label += "".join(attribute_rows)
         
-        # Method section
-        has_methods = False
-        method_rows = ""
+        # Method section, collected as a list of rows and joined once
+        method_rows = []
         
         # Find all functions that are children of this class
         for function in self.diagram.functions:
             if function in class_obj.children:
-                has_methods = True
                 method_signature = self._format_function_signature(function)
-                method_rows += f'<TR><TD ALIGN="LEFT" PORT="{function.id}">{method_signature}</TD></TR>'
+                method_rows.append(f'<TR><TD ALIGN="LEFT" PORT="{function.id}">{method_signature}</TD></TR>')
         
-        if has_methods:
+        if method_rows:
             label += f'<TR><TD BGCOLOR="#E5E9F0" COLSPAN="1"><I>Methods</I></TD></TR>'
-            label += method_rows
+            label += "".join(method_rows)
         
         # Close the table
         label += '</TABLE>>'
@@ -304,20 +300,18 @@ class CodeRenderer:
             superinterfaces_str = ", ".join(interface.superinterfaces)
             label += f'<TR><TD ALIGN="LEFT" PORT="superinterfaces">extends {superinterfaces_str}</TD></TR>'
         
-        # Method section
-        has_methods = False
-        method_rows = ""
+        # Method section, collected as a list of rows and joined once
+        method_rows = []
         
         # Find all functions that are children of this interface
         for function in self.diagram.functions:
             if function in interface.children:
-                has_methods = True
                 method_signature = self._format_function_signature(function)
-                method_rows += f'<TR><TD ALIGN="LEFT" PORT="{function.id}">{method_signature}</TD></TR>'
+                method_rows.append(f'<TR><TD ALIGN="LEFT" PORT="{function.id}">{method_signature}</TD></TR>')
         
-        if has_methods:
+        if method_rows:
             label += f'<TR><TD BGCOLOR="#E5E9F0" COLSPAN="1"><I>Methods</I></TD></TR>'
-            label += method_rows
+            label += "".join(method_rows)
         
         # Close the table
         label += '</TABLE>>'
@@ -346,8 +340,7 @@ class CodeRenderer:
         
         # Add enum values
         if enum.values:
-            for value in enum.values:
-                label += f'<TR><TD ALIGN="LEFT">{value}</TD></TR>'
+            label += "".join(f'<TR><TD ALIGN="LEFT">{value}</TD></TR>' for value in enum.values)
         
         # Close the table
         label += '</TABLE>>'
@@ -6,10 +6,14 @@ This module provides specialized rendering for System Context Diagrams,
 visualizing systems, people, external systems, and their relationships.
 """
 
+import io
 import math
 import os
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple, Any, Union
+from typing import ClassVar, Dict, List, Optional, Set, Tuple, Any, Union
+from xml.sax.saxutils import escape, quoteattr
 
 from svgwrite import Drawing
 from svgwrite.container import Group
@@ -24,6 +28,17 @@ from pydiagrams.diagrams.architectural.context_diagram import (
 from pydiagrams.renderers.svg_renderer import SVGRenderer
 
 
+# Output directories already created by this module, so batch renders into
+# the same directory only hit the filesystem once
+_created_output_dirs: Set[str] = set()
+
+# Dash patterns shared by every boundary and relationship line
+_DASH_BOUNDARY = "5,5"
+_DASH_DEPENDS_ON = "10,5"
+_DASH_SENDS_DATA = "5,3"
+_DASH_RECEIVES_DATA = "5,3,1,3"
+
+
 @dataclass
 class SystemContextDiagramRenderer(SVGRenderer):
     """
@@ -48,6 +63,9 @@ class SystemContextDiagramRenderer(SVGRenderer):
     line_stroke_width: int = 2
     arrow_size: int = 10
     
+    # Number of threads building element markup (1 renders sequentially)
+    render_workers: int = 1
+    
     # Colors
     element_fill: Dict[ElementType, str] = field(default_factory=lambda: {
         ElementType.SYSTEM: "#1168BD",
@@ -69,6 +87,20 @@ class SystemContextDiagramRenderer(SVGRenderer):
     boundary_fill: str = "#FFFFFF"
     boundary_stroke: str = "#444444"
     
+    # Boundary mapping of the last rendered diagram, with the boundary
+    # contents it was built from
+    _boundary_map_cache: Optional[Tuple[Tuple[Any, ...], Dict[str, List[str]]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    # Type labels shown at the top of box-shaped elements
+    _TYPE_LABELS: ClassVar[Dict[ElementType, str]] = {
+        ElementType.SYSTEM: "[System]",
+        ElementType.EXTERNAL_SYSTEM: "[External System]",
+        ElementType.CONTAINER: "[Container]",
+        ElementType.DATABASE: "[Database]"
+    }
+    
     def render(self, 
                diagram: SystemContextDiagram, 
                output_path: str, 
@@ -85,14 +117,23 @@ class SystemContextDiagramRenderer(SVGRenderer):
             The path to the rendered SVG file
         """
         # Create output directory if it doesn't exist
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        if output_dir not in _created_output_dirs:
+            os.makedirs(output_dir, exist_ok=True)
+            _created_output_dirs.add(output_dir)
         
         # Create SVG Drawing
+        # The markup is generated from trusted diagram data, so svgwrite's
+        # per-attribute validation is skipped
         self.drawing = Drawing(
             output_path,
-            size=(f"{self.width}{self.unit}", f"{self.height}{self.unit}")
+            size=(f"{self.width}{self.unit}", f"{self.height}{self.unit}"),
+            debug=False
         )
         
+        # Raw SVG fragments to splice into layer groups when saving
+        self._raw_layers: Dict[str, List[str]] = {}
+        
         # Add definitions
         self._add_defs()
         
@@ -114,53 +155,265 @@ class SystemContextDiagramRenderer(SVGRenderer):
             if boundary.id in boundary_bounds:
                 self._render_boundary(boundary_group, boundary, boundary_bounds[boundary.id])
         
-        # Draw relationships
+        # Draw relationships, batched into one path per dash pattern
         relationship_midpoints = {}
-        for relationship in diagram.relationships:
-            source_pos = positions.get(relationship.source_id)
-            target_pos = positions.get(relationship.target_id)
-            
-            if source_pos and target_pos:
-                midpoint = self._render_relationship(
-                    relationship_group,
-                    relationship,
-                    source_pos,
-                    target_pos
-                )
-                relationship_midpoints[relationship.id] = midpoint
+        relationship_segments = {}
+        # Only relationships whose two ends have been positioned can be drawn
+        positioned_relationships = [
+            (relationship, positions[relationship.source_id], positions[relationship.target_id])
+            for relationship in diagram.relationships
+            if relationship.source_id in positions and relationship.target_id in positions
+        ]
+        for relationship, source_pos, target_pos in positioned_relationships:
+            midpoint = self._render_relationship(
+                relationship_segments,
+                relationship,
+                source_pos,
+                target_pos
+            )
+            relationship_midpoints[relationship.id] = midpoint
+        self._render_relationship_paths(relationship_group, relationship_segments)
         
         # Draw elements
-        for element in diagram.elements:
-            pos = positions.get(element.id, (self.width // 2, self.height // 2))
-            self._render_element(element_group, element, pos)
+        default_pos = (self.width // 2, self.height // 2)
+        element_positions = [positions.get(element.id, default_pos) for element in diagram.elements]
+        if self.render_workers > 1 and len(diagram.elements) > 1:
+            # Each element's markup is independent; map() keeps the element order
+            with ThreadPoolExecutor(max_workers=self.render_workers) as executor:
+                markups = list(executor.map(self._element_markup, diagram.elements, element_positions))
+            for markup in markups:
+                self._emit_raw(element_group["id"], markup)
+        else:
+            for element, pos in zip(diagram.elements, element_positions):
+                self._render_element(element_group, element, pos)
         
-        # Draw relationship labels
+        # Draw relationship labels (skipping relationships without label text)
         for relationship in diagram.relationships:
-            if relationship.id in relationship_midpoints:
+            if (relationship.id in relationship_midpoints
+                    and (relationship.name or relationship.technology)):
                 self._render_relationship_label(
                     label_group,
                     relationship,
                     relationship_midpoints[relationship.id]
                 )
         
-        # Save the SVG
-        self.drawing.save()
+        # Save the SVG, serializing it in memory and writing it in one call
+        buffer = io.StringIO()
+        self.drawing.write(buffer, pretty=False)
+        svg_content = buffer.getvalue()
+        for layer_id, fragments in self._raw_layers.items():
+            # The fragments can only be spliced into a group svgwrite wrote
+            # as an empty element; anything else would silently drop them
+            placeholder = f'<g id="{layer_id}" />'
+            if placeholder not in svg_content:
+                raise RuntimeError(
+                    f"Cannot add raw SVG fragments to layer {layer_id!r}: "
+                    "the group is missing or already has svgwrite children"
+                )
+            svg_content = svg_content.replace(
+                placeholder,
+                f'<g id="{layer_id}">{"".join(fragments)}</g>',
+                1
+            )
+        
+        # Recreate the output directory if it was removed after it was cached
+        try:
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(svg_content)
+        except FileNotFoundError:
+            os.makedirs(output_dir, exist_ok=True)
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(svg_content)
         return output_path
     
+    def _emit_raw(self, layer_id: str, svg: str) -> None:
+        """
+        Queue a raw SVG fragment for a layer group.
+        
+        Raw fragments skip svgwrite's element objects and attribute
+        validation, and are spliced into the (otherwise empty) group with
+        the given ID when the drawing is saved. That group must not get
+        any svgwrite children.
+        
+        Args:
+            layer_id: The ID of the layer group to add the fragment to
+            svg: The SVG markup to add
+        """
+        self._raw_layers.setdefault(layer_id, []).append(svg)
+    
+    def _raw_text(self, text: str, x: float, y: float, class_name: str, fill: str) -> str:
+        """
+        Build the markup of a text node.
+        
+        Args:
+            text: The text content
+            x: The x coordinate of the text anchor
+            y: The y coordinate of the text baseline
+            class_name: The stylesheet class of the text
+            fill: The text color
+            
+        Returns:
+            The SVG markup of the text node
+        """
+        return (f'<text class="{class_name}" fill={quoteattr(fill)} x="{x}" y="{y}">'
+                f'{escape(text)}</text>')
+    
     def _add_defs(self) -> None:
-        """Add definitions to the SVG (markers, patterns, etc.)."""
-        # Add arrow marker for relationships
-        marker = self.drawing.marker(
-            insert=(10, 5),
-            size=(10, 10),
-            orient="auto",
-            id="arrow"
+        """Add definitions to the SVG (markers, patterns, stylesheet, etc.)."""
+        # Add the shared text styles, so text nodes only carry a class name
+        self._add_context_stylesheet()
+        
+        # Add one reusable shape template per element type; elements
+        # reference these with <use> instead of rebuilding their shapes
+        for element_type in ElementType:
+            self._add_element_template(element_type)
+    
+    def _add_context_stylesheet(self) -> None:
+        """Add a CSS stylesheet with the text styles used by the diagram."""
+        self.drawing.defs.add(self.drawing.style(content="""
+            .element-name {
+                font: bold 14px Arial, sans-serif;
+                text-anchor: middle;
+            }
+            .element-description {
+                font: 12px Arial, sans-serif;
+                text-anchor: middle;
+            }
+            .element-type {
+                font: italic 12px Arial, sans-serif;
+                text-anchor: middle;
+            }
+            .relationship-name {
+                font: 12px Arial, sans-serif;
+                text-anchor: middle;
+                fill: #000000;
+            }
+            .relationship-technology {
+                font: italic 10px Arial, sans-serif;
+                text-anchor: middle;
+                fill: #666666;
+            }
+            .boundary-name {
+                font: bold 16px Arial, sans-serif;
+                fill: #000000;
+            }
+            .boundary-description {
+                font: italic 12px Arial, sans-serif;
+                fill: #666666;
+            }
+        """))
+    
+    def _add_element_template(self, element_type: ElementType) -> None:
+        """
+        Add a <symbol> template holding the static shapes of an element type.
+        
+        The template is drawn in its own coordinate space with the origin at
+        the top-left corner of the element's bounding box.
+        
+        Args:
+            element_type: The ElementType to build the template for
+        """
+        fill_color = self.element_fill.get(element_type, "#CCCCCC")
+        width, height = self._template_size(element_type)
+        
+        symbol = self.drawing.symbol(id=f"tpl-{element_type.name}", overflow="visible")
+        symbol.viewbox(0, 0, width, height)
+        add = symbol.add
+        
+        if element_type == ElementType.PERSON:
+            # Person is a stick figure above a box
+            person_width, person_height = self.person_width, self.person_height
+            x = person_width // 2
+            head_radius = 15
+            head_center_y = head_radius + 10
+            head_bottom = head_center_y + head_radius
+            
+            add(Circle(
+                center=(x, head_center_y),
+                r=head_radius,
+                fill=fill_color,
+                stroke="none"
+            ))
+            
+            # Body, arms and legs
+            for start, end in (
+                ((x, head_bottom), (x, head_bottom + 30)),
+                ((x - 20, head_bottom + 15), (x + 20, head_bottom + 15)),
+                ((x, head_bottom + 30), (x - 15, head_bottom + 50)),
+                ((x, head_bottom + 30), (x + 15, head_bottom + 50)),
+            ):
+                add(Line(start=start, end=end, stroke=fill_color, stroke_width=4))
+            
+            # Box for name and description
+            add(Rect(
+                insert=(0, person_height // 2 + person_height // 4),
+                size=(person_width, person_height // 2),
+                rx=3, ry=3,
+                fill=fill_color,
+                stroke="none"
+            ))
+        else:
+            element_width, element_height = self.element_width, self.element_height
+            add(Rect(
+                insert=(0, 0),
+                size=(element_width, element_height),
+                rx=3, ry=3,
+                fill=fill_color,
+                stroke="none"
+            ))
+            
+            if element_type == ElementType.DATABASE:
+                # Add database-specific styling (rounded bottom, lines at top)
+                half_width = element_width // 2
+                bottom = element_height // 2 * 2 - 1
+                add(Path(
+                    d=f"M0 20 A{half_width} 10 0 0 1 {half_width * 2} 20",
+                    fill="none",
+                    stroke="#FFFFFF",
+                    stroke_width=1.5
+                ))
+                add(Path(
+                    d=f"M0 {bottom} A{half_width} 10 0 0 0 {half_width * 2} {bottom}",
+                    fill="none",
+                    stroke="#FFFFFF",
+                    stroke_width=1.5
+                ))
+        
+        self.drawing.defs.add(symbol)
+    
+    def _template_size(self, element_type: ElementType) -> Tuple[int, int]:
+        """
+        Get the size of the <symbol> template for an element type.
+        
+        Args:
+            element_type: The ElementType of the template
+            
+        Returns:
+            The (width, height) of the template
+        """
+        if element_type == ElementType.PERSON:
+            # The name box hangs below the nominal person height
+            return (self.person_width,
+                    self.person_height // 2 + self.person_height // 4 + self.person_height // 2)
+        return (self.element_width, self.element_height)
+    
+    def _add_element_instance(self,
+                              parts: List[str],
+                              element_type: ElementType,
+                              insert: Tuple[float, float]) -> None:
+        """
+        Reference the <symbol> template of an element type.
+        
+        Args:
+            parts: The markup fragments of the element to add the reference to
+            element_type: The ElementType whose template is referenced
+            insert: The (x, y) position of the template's top-left corner
+        """
+        width, height = self._template_size(element_type)
+        parts.append(
+            f'<use height="{height}" width="{width}" x="{insert[0]}" '
+            f'xlink:href="#tpl-{element_type.name}" y="{insert[1]}" />'
         )
-        marker.add(self.drawing.path(
-            "M0,0 L10,5 L0,10 L3,5 Z",
-            fill=self.relationship_color
-        ))
-        self.drawing.defs.add(marker)
     
     def _calculate_positions(self, diagram: SystemContextDiagram) -> Dict[str, Tuple[int, int]]:
         """
@@ -181,18 +434,18 @@ class SystemContextDiagramRenderer(SVGRenderer):
         # If the layout manager didn't provide positions for all elements,
         # use a simple grid layout as fallback
         if not positions or len(positions) < len(diagram.elements):
-            positions = {}
             rows = int(math.ceil(math.sqrt(len(diagram.elements))))
             cols = int(math.ceil(len(diagram.elements) / rows))
             
-            for i, element in enumerate(diagram.elements):
-                row = i // cols
-                col = i % cols
-                
-                x = 100 + col * (self.element_width + self.element_spacing)
-                y = 100 + row * (self.element_height + self.element_spacing)
-                
-                positions[element.id] = (x, y)
+            # Grid coordinates only depend on the row/column, so compute
+            # each one once rather than once per element
+            xs = [100 + col * (self.element_width + self.element_spacing) for col in range(cols)]
+            ys = [100 + row * (self.element_height + self.element_spacing) for row in range(rows)]
+            
+            positions = {
+                element.id: (xs[i % cols], ys[i // cols])
+                for i, element in enumerate(diagram.elements)
+            }
         
         return positions
     
@@ -200,13 +453,26 @@ class SystemContextDiagramRenderer(SVGRenderer):
         """
         Create a mapping from boundary IDs to lists of element IDs.
         
+        The mapping is reused when the same diagram is rendered again with
+        unchanged boundaries.
+        
         Args:
             diagram: The SystemContextDiagram to process
             
         Returns:
             Dictionary mapping boundary IDs to lists of element IDs
         """
-        return {boundary.id: boundary.element_ids for boundary in diagram.boundaries}
+        cache_key = (id(diagram),) + tuple(
+            (boundary.id, tuple(boundary.element_ids)) for boundary in diagram.boundaries
+        )
+        if self._boundary_map_cache is not None and self._boundary_map_cache[0] == cache_key:
+            return self._boundary_map_cache[1]
+        
+        boundary_elements = {
+            boundary.id: list(boundary.element_ids) for boundary in diagram.boundaries
+        }
+        self._boundary_map_cache = (cache_key, boundary_elements)
+        return boundary_elements
     
     def _calculate_boundary_bounds(
         self,
@@ -227,39 +493,39 @@ class SystemContextDiagramRenderer(SVGRenderer):
         """
         boundary_bounds = {}
         
+        # Find elements by ID to determine their sizes
+        element_dict = {elem.id: elem for elem in diagram.elements}
+        
         for boundary_id, element_ids in boundary_elements.items():
-            if not element_ids:
-                continue
+            # Get the extents of all positioned elements in this boundary,
+            # skipping IDs that lack either a position or an element
+            extents = []
+            for e_id in element_ids:
+                pos = positions.get(e_id)
+                element = element_dict.get(e_id)
+                if pos is None or element is None:
+                    continue
                 
-            # Get positions of all elements in this boundary
-            element_positions = [positions[e_id] for e_id in element_ids if e_id in positions]
+                if element.element_type == ElementType.PERSON:
+                    half_width, half_height = self.person_width // 2, self.person_height // 2
+                else:
+                    half_width, half_height = self.element_width // 2, self.element_height // 2
+                extents.append((pos[0] - half_width, pos[1] - half_height,
+                                pos[0] + half_width, pos[1] + half_height))
             
-            if not element_positions:
+            if not extents:
                 continue
-                
-            # Find elements by ID to determine their sizes
-            element_dict = {elem.id: elem for elem in diagram.elements}
-            element_sizes = []
-            
-            for e_id in element_ids:
-                if e_id in element_dict:
-                    element = element_dict[e_id]
-                    if element.element_type == ElementType.PERSON:
-                        element_sizes.append((self.person_width, self.person_height))
-                    else:
-                        element_sizes.append((self.element_width, self.element_height))
-            
-            # Calculate min/max coordinates with element sizes
-            min_x = float('inf')
-            min_y = float('inf')
-            max_x = float('-inf')
-            max_y = float('-inf')
             
-            for pos, size in zip(element_positions, element_sizes):
-                min_x = min(min_x, pos[0] - size[0] // 2)
-                min_y = min(min_y, pos[1] - size[1] // 2)
-                max_x = max(max_x, pos[0] + size[0] // 2)
-                max_y = max(max_y, pos[1] + size[1] // 2)
+            # Calculate min/max coordinates with element sizes; a boundary
+            # around a single element (common in context diagrams) is just
+            # that element's extent
+            if len(extents) == 1:
+                min_x, min_y, max_x, max_y = extents[0]
+            else:
+                min_x = min(extent[0] for extent in extents)
+                min_y = min(extent[1] for extent in extents)
+                max_x = max(extent[2] for extent in extents)
+                max_y = max(extent[3] for extent in extents)
             
             # Add padding
             min_x -= self.boundary_padding
@@ -287,233 +553,131 @@ class SystemContextDiagramRenderer(SVGRenderer):
             element: The ContextElement object to render
             position: The (x, y) position to place the element
         """
+        self._emit_raw(group["id"], self._element_markup(element, position))
+    
+    def _element_markup(self,
+                        element: ContextElement,
+                        position: Tuple[int, int]) -> str:
+        """
+        Build the SVG markup of an element at the specified position.
+        
+        Elements are the bulk of a diagram, so they are built as raw SVG
+        markup rather than as svgwrite objects. The markup only depends on
+        the element and its position, so elements can be built in parallel.
+        
+        Args:
+            element: The ContextElement object to render
+            position: The (x, y) position to place the element
+            
+        Returns:
+            The SVG markup of the element group
+        """
         x, y = position
         
-        # Create element group
-        element_group = group.add(Group(id=f"element-{element.id}"))
+        # Open element group
+        parts = [f'<g id={quoteattr(f"element-{element.id}")}>']
         
-        # Get styling based on element type
-        fill_color = self.element_fill.get(element.element_type, "#CCCCCC")
+        # Get styling based on element type (fills live in the shape templates)
         text_color = self.element_text_color.get(element.element_type, "#000000")
         
         if element.element_type == ElementType.PERSON:
             # Person is a special case - render as a stick figure above a box
-            self._render_person(element_group, element, (x, y), fill_color, text_color)
+            self._render_person(parts, element, (x, y), text_color)
         else:
             # Other elements are rendered as rectangles
-            self._render_box_element(element_group, element, (x, y), fill_color, text_color)
+            self._render_box_element(parts, element, (x, y), text_color)
+        
+        parts.append("</g>")
+        return "".join(parts)
     
     def _render_person(self,
-                      group: Group,
+                      parts: List[str],
                       element: ContextElement,
                       position: Tuple[int, int],
-                      fill_color: str,
                       text_color: str) -> None:
         """
         Render a person element (stick figure and box).
         
         Args:
-            group: The SVG group to add the person to
+            parts: The markup fragments to add the person to
             element: The ContextElement object to render
             position: The (x, y) position to place the person
-            fill_color: Fill color for the person
             text_color: Text color for the person's name
         """
         x, y = position
+        person_height = self.person_height
+        add = parts.append
         
-        # Draw person icon (head and body)
-        head_radius = 15
-        head_center_y = y - self.person_height // 2 + head_radius + 10
-        
-        # Head (circle)
-        head = Circle(
-            center=(x, head_center_y),
-            r=head_radius,
-            fill=fill_color,
-            stroke="none"
-        )
-        group.add(head)
-        
-        # Body (line)
-        body = Line(
-            start=(x, head_center_y + head_radius),
-            end=(x, head_center_y + head_radius + 30),
-            stroke=fill_color,
-            stroke_width=4
-        )
-        group.add(body)
-        
-        # Arms (line)
-        arms = Line(
-            start=(x - 20, head_center_y + head_radius + 15),
-            end=(x + 20, head_center_y + head_radius + 15),
-            stroke=fill_color,
-            stroke_width=4
-        )
-        group.add(arms)
-        
-        # Legs (lines)
-        leg1 = Line(
-            start=(x, head_center_y + head_radius + 30),
-            end=(x - 15, head_center_y + head_radius + 50),
-            stroke=fill_color,
-            stroke_width=4
-        )
-        group.add(leg1)
-        
-        leg2 = Line(
-            start=(x, head_center_y + head_radius + 30),
-            end=(x + 15, head_center_y + head_radius + 50),
-            stroke=fill_color,
-            stroke_width=4
+        # Stick figure and box come from the shared person template
+        self._add_element_instance(
+            parts, element.element_type,
+            (x - self.person_width // 2, y - person_height // 2)
         )
-        group.add(leg2)
-        
-        # Box for name and description
-        box_y = y + self.person_height // 4
-        box_height = self.person_height // 2
-        
-        rect = Rect(
-            insert=(x - self.person_width // 2, box_y),
-            size=(self.person_width, box_height),
-            rx=3, ry=3,
-            fill=fill_color,
-            stroke="none"
-        )
-        group.add(rect)
+        box_y = y + person_height // 4
         
         # Add name
-        name_text = Text(
-            element.name,
-            insert=(x, box_y + 20),
-            fill=text_color,
-            font_family="Arial, sans-serif",
-            font_size="14px",
-            text_anchor="middle",
-            font_weight="bold"
-        )
-        group.add(name_text)
+        add(self._raw_text(element.name, x, box_y + 20, "element-name", text_color))
         
         # Add description (if it fits)
         if element.description:
-            desc_text = Text(
-                element.description,
-                insert=(x, box_y + 40),
-                fill=text_color,
-                font_family="Arial, sans-serif",
-                font_size="12px",
-                text_anchor="middle"
-            )
-            group.add(desc_text)
+            add(self._raw_text(
+                element.description, x, box_y + 40, "element-description", text_color
+            ))
     
     def _render_box_element(self,
-                           group: Group,
+                           parts: List[str],
                            element: ContextElement,
                            position: Tuple[int, int],
-                           fill_color: str,
                            text_color: str) -> None:
         """
         Render a box-shaped element.
         
         Args:
-            group: The SVG group to add the element to
+            parts: The markup fragments to add the element to
             element: The ContextElement object to render
             position: The (x, y) position to place the element
-            fill_color: Fill color for the element
             text_color: Text color for the element's name
         """
         x, y = position
+        add = parts.append
         
         # Adjust position to center the element
         x_offset = self.element_width // 2
         y_offset = self.element_height // 2
         
-        # Create the main rectangle
-        rect = Rect(
-            insert=(x - x_offset, y - y_offset),
-            size=(self.element_width, self.element_height),
-            rx=3, ry=3,
-            fill=fill_color,
-            stroke="none"
-        )
-        group.add(rect)
-        
-        # Special treatment for database elements
-        if element.element_type == ElementType.DATABASE:
-            # Add database-specific styling (rounded bottom, lines at top)
-            top_arc = Path(
-                d=f"M{x - x_offset} {y - y_offset + 20} A{self.element_width // 2} 10 0 0 1 {x + x_offset} {y - y_offset + 20}",
-                fill="none",
-                stroke="#FFFFFF",
-                stroke_width=1.5
-            )
-            group.add(top_arc)
-            
-            bottom_arc = Path(
-                d=f"M{x - x_offset} {y + y_offset - 1} A{self.element_width // 2} 10 0 0 0 {x + x_offset} {y + y_offset - 1}",
-                fill="none",
-                stroke="#FFFFFF",
-                stroke_width=1.5
-            )
-            group.add(bottom_arc)
+        # Rectangle (and database arcs) come from the shared element template
+        self._add_element_instance(parts, element.element_type, (x - x_offset, y - y_offset))
         
         # Add element type label at the top
-        type_label = ""
-        if element.element_type == ElementType.SYSTEM:
-            type_label = "[System]"
-        elif element.element_type == ElementType.EXTERNAL_SYSTEM:
-            type_label = "[External System]"
-        elif element.element_type == ElementType.CONTAINER:
-            type_label = "[Container]"
-        elif element.element_type == ElementType.DATABASE:
-            type_label = "[Database]"
-            
+        type_label = self._TYPE_LABELS.get(element.element_type, "")
         if type_label:
-            type_text = Text(
-                type_label,
-                insert=(x, y - y_offset + 20),
-                fill=text_color,
-                font_family="Arial, sans-serif",
-                font_size="12px",
-                text_anchor="middle",
-                font_style="italic"
-            )
-            group.add(type_text)
+            add(self._raw_text(type_label, x, y - y_offset + 20, "element-type", text_color))
         
         # Add name
-        name_text = Text(
-            element.name,
-            insert=(x, y),
-            fill=text_color,
-            font_family="Arial, sans-serif",
-            font_size="14px",
-            text_anchor="middle",
-            font_weight="bold"
-        )
-        group.add(name_text)
+        add(self._raw_text(element.name, x, y, "element-name", text_color))
         
         # Add description (if it fits)
         if element.description:
-            desc_text = Text(
-                self._wrap_text(element.description, 25),
-                insert=(x, y + 25),
-                fill=text_color,
-                font_family="Arial, sans-serif",
-                font_size="12px",
-                text_anchor="middle"
-            )
-            group.add(desc_text)
+            add(self._raw_text(
+                self._wrap_text(element.description, 25), x, y + 25,
+                "element-description", text_color
+            ))
     
     def _render_relationship(self,
-                            group: Group,
+                            segments: Dict[Optional[str], List[Tuple[float, ...]]],
                             relationship: ContextRelationship,
                             start_pos: Tuple[int, int],
                             end_pos: Tuple[int, int]) -> Tuple[float, float]:
         """
         Render a relationship between two elements.
         
+        The line is not drawn here; its segment is collected by dash pattern
+        and drawn later by _render_relationship_paths.
+        
         Args:
-            group: The SVG group to add the relationship to
+            segments: Dictionary mapping dash patterns (None for solid lines)
+                to (x1, y1, x2, y2, dx, dy) line segments, (dx, dy) being the
+                unit direction of the drawn line
             relationship: The ContextRelationship object to render
             start_pos: The (x, y) position of the source element
             end_pos: The (x, y) position of the target element
@@ -527,50 +691,96 @@ class SystemContextDiagramRenderer(SVGRenderer):
         # Calculate direction vector
         dx = x2 - x1
         dy = y2 - y1
-        length = math.sqrt(dx*dx + dy*dy)
+        length = math.hypot(dx, dy)
         
         if length < 1:  # Avoid division by zero
             return (x1, y1)
         
-        # Normalize direction vector
-        dx /= length
-        dy /= length
+        # Normalize direction vector with a single division
+        inv_length = 1.0 / length
+        dx *= inv_length
+        dy *= inv_length
         
         # Calculate offset from center to edge of element
         offset = self.element_width // 2 + 10  # A bit more than half-width
+        offset_x = dx * offset
+        offset_y = dy * offset
         
-        # Adjust start and end points to be on the edge of elements
-        x1 += dx * offset
-        y1 += dy * offset
-        x2 -= dx * offset
-        y2 -= dy * offset
-        
-        # Calculate the midpoint for label placement
+        # The midpoint for label placement is the same before and after
+        # moving both ends inwards by the same offset
         mid_x = (x1 + x2) / 2
         mid_y = (y1 + y2) / 2
         
-        # Create the relationship line
-        line = Line(
-            start=(x1, y1),
-            end=(x2, y2),
-            stroke=self.relationship_color,
-            stroke_width=self.line_stroke_width,
-            marker_end="url(#arrow)"
-        )
+        # Adjust start and end points to be on the edge of elements
+        x1 += offset_x
+        y1 += offset_y
+        x2 -= offset_x
+        y2 -= offset_y
         
         # Styling based on relationship type
         # For simplicity, just using different dash patterns for different types
+        dasharray = None
         if relationship.relationship_type == RelationshipType.DEPENDS_ON:
-            line["stroke-dasharray"] = "10,5"
+            dasharray = _DASH_DEPENDS_ON
         elif relationship.relationship_type == RelationshipType.SENDS_DATA_TO:
-            line["stroke-dasharray"] = "5,3"
+            dasharray = _DASH_SENDS_DATA
         elif relationship.relationship_type == RelationshipType.RECEIVES_DATA_FROM:
-            line["stroke-dasharray"] = "5,3,1,3"
+            dasharray = _DASH_RECEIVES_DATA
+        
+        # The drawn line points backwards when the elements are closer
+        # together than the two edge offsets
+        if length < 2 * offset:
+            dx, dy = -dx, -dy
         
-        group.add(line)
+        segments.setdefault(dasharray, []).append((x1, y1, x2, y2, dx, dy))
         
         return (mid_x, mid_y)
     
+    def _render_relationship_paths(self,
+                                   group: Group,
+                                   segments: Dict[Optional[str], List[Tuple[float, ...]]]) -> None:
+        """
+        Draw the collected relationship lines with one path per dash pattern.
+        
+        Markers only decorate the last vertex of a path, so instead of an
+        arrow marker the arrowheads of all relationships are drawn as a single
+        filled path of their own.
+        
+        Args:
+            group: The SVG group to add the paths to
+            segments: Dictionary mapping dash patterns (None for solid lines)
+                to (x1, y1, x2, y2, dx, dy) line segments, (dx, dy) being the
+                unit direction of the drawn line
+        """
+        # Arrowhead outline ("M0,0 L10,5 L0,10 L3,5 Z" in a 10x10 box),
+        # relative to its tip and scaled by the stroke width like a marker
+        scale = self.line_stroke_width
+        arrow_points = [((px - 10) * scale, (py - 5) * scale)
+                        for px, py in ((0, 0), (10, 5), (0, 10), (3, 5))]
+        
+        arrowheads = []
+        for dasharray, lines in segments.items():
+            path = Path(
+                d="".join(f"M{x1:.1f} {y1:.1f}L{x2:.1f} {y2:.1f}"
+                          for x1, y1, x2, y2, _, _ in lines),
+                fill="none",
+                stroke=self.relationship_color,
+                stroke_width=self.line_stroke_width
+            )
+            if dasharray:
+                path["stroke-dasharray"] = dasharray
+            group.add(path)
+            
+            for _, _, x2, y2, dx, dy in lines:
+                # Rotate the arrow outline onto the line direction at its end
+                arrowheads.append("M" + "L".join(
+                    f"{x2 + ax * dx - ay * dy:.1f} {y2 + ax * dy + ay * dx:.1f}"
+                    for ax, ay in arrow_points
+                ) + "Z")
+        
+        if arrowheads:
+            group.add(Path(d="".join(arrowheads), fill=self.relationship_color, stroke="none"))
+    
     def _render_relationship_label(self,
                                   group: Group,
                                   relationship: ContextRelationship,
@@ -584,44 +794,44 @@ class SystemContextDiagramRenderer(SVGRenderer):
             position: The (x, y) position for the label
         """
         x, y = position
+        has_name = bool(relationship.name)
+        has_technology = bool(relationship.technology)
         
         # Don't render if there's no label text
-        if not relationship.name and not relationship.technology:
+        if not has_name and not has_technology:
             return
         
-        # Create background for the label
-        label_bg = Rect(
-            insert=(x - 70, y - 15),
-            size=(140, 30),
-            rx=5, ry=5,
-            fill="white",
-            fill_opacity=0.8,
-            stroke="none"
-        )
-        group.add(label_bg)
+        # Create a background sized to the label text; short labels
+        # are readable enough over the line without one
+        label_length = max(len(relationship.name) if has_name else 0,
+                           len(relationship.technology) + 2 if has_technology else 0)
+        if label_length >= 12:
+            label_width = label_length * 7 + 10
+            label_bg = Rect(
+                insert=(x - label_width / 2, y - 15),
+                size=(label_width, 30),
+                rx=5, ry=5,
+                fill="white",
+                fill_opacity=0.8,
+                stroke="none"
+            )
+            group.add(label_bg)
         
         # Add relationship name
-        if relationship.name:
+        if has_name:
             name_text = Text(
                 relationship.name,
                 insert=(x, y),
-                fill="#000000",
-                font_family="Arial, sans-serif",
-                font_size="12px",
-                text_anchor="middle"
+                class_="relationship-name"
             )
             group.add(name_text)
         
         # Add technology if present
-        if relationship.technology:
+        if has_technology:
             tech_text = Text(
                 f"[{relationship.technology}]",
-                insert=(x, y + (0 if not relationship.name else 15)),
-                fill="#666666",
-                font_family="Arial, sans-serif",
-                font_size="10px",
-                text_anchor="middle",
-                font_style="italic"
+                insert=(x, y + (15 if has_name else 0)),
+                class_="relationship-technology"
             )
             group.add(tech_text)
     
@@ -648,7 +858,7 @@ class SystemContextDiagramRenderer(SVGRenderer):
             fill_opacity=0.1,
             stroke=self.boundary_stroke,
             stroke_width=1.5,
-            stroke_dasharray="5,5"
+            stroke_dasharray=_DASH_BOUNDARY
         )
         group.add(rect)
         
@@ -656,10 +866,7 @@ class SystemContextDiagramRenderer(SVGRenderer):
         name_text = Text(
             boundary.name,
             insert=(x + 15, y + 25),
-            fill="#000000",
-            font_family="Arial, sans-serif",
-            font_size="16px",
-            font_weight="bold"
+            class_="boundary-name"
         )
         group.add(name_text)
         
@@ -668,10 +875,7 @@ class SystemContextDiagramRenderer(SVGRenderer):
             desc_text = Text(
                 boundary.description,
                 insert=(x + 15, y + 45),
-                fill="#666666",
-                font_family="Arial, sans-serif",
-                font_size="12px",
-                font_style="italic"
+                class_="boundary-description"
             )
             group.add(desc_text)
     
@@ -688,22 +892,6 @@ class SystemContextDiagramRenderer(SVGRenderer):
         """
         if len(text) <= max_chars_per_line:
             return text
-            
-        words = text.split()
-        lines = []
-        current_line = []
-        current_length = 0
-        
-        for word in words:
-            if current_length + len(word) + len(current_line) <= max_chars_per_line:
-                current_line.append(word)
-                current_length += len(word)
-            else:
-                lines.append(" ".join(current_line))
-                current_line = [word]
-                current_length = len(word)
         
-        if current_line:
-            lines.append(" ".join(current_line))
-            
-        return "\n".join(lines) 
\ No newline at end of file
+        # Words longer than a line are kept whole rather than split
+        return "\n".join(textwrap.wrap(text, width=max_chars_per_line, break_long_words=False)) 
\ No newline at end of file
@@ -8,14 +8,9 @@ visualizing nodes, artifacts, and their relationships.
 
 import math
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set, Tuple, Any, Union
-
-from svgwrite import Drawing
-from svgwrite.container import Group
-from svgwrite.shapes import Line, Rect, Circle, Polygon
-from svgwrite.text import Text
-from svgwrite.path import Path
+from xml.sax.saxutils import escape, quoteattr
 
 from pydiagrams.diagrams.architectural.deployment_diagram import (
     DeploymentDiagram, DeploymentNode, DeploymentArtifact,
@@ -23,6 +18,99 @@ from pydiagrams.diagrams.architectural.deployment_diagram import (
 )
 from pydiagrams.renderers.svg_renderer import SVGRenderer
 
+# Output directories already created by this module, so batch renders into
+# the same directory only hit the filesystem once
+_created_output_dirs: Set[str] = set()
+
+
+def _format_number(value: float) -> str:
+    """
+    Format a coordinate for SVG output with at most two decimals.
+    
+    Trailing zeros are dropped, so whole numbers are written without
+    a fractional part (150.0 becomes "150").
+    
+    Args:
+        value: The number to format
+        
+    Returns:
+        The formatted number
+    """
+    text = f"{value:.2f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+class _QuadTree:
+    """
+    Quad-tree of axis-aligned boxes for overlap queries.
+    
+    Boxes are (left, top, right, bottom) tuples. A box stays in the
+    deepest quadrant that fully contains it, so boxes that straddle a
+    split or lie outside the tree's bounds are kept by the parent.
+    """
+    
+    max_objects = 4
+    max_levels = 6
+    
+    def __init__(self, bounds: Tuple[float, float, float, float], level: int = 0):
+        self.bounds = bounds
+        self.level = level
+        self.boxes: List[Tuple[float, float, float, float]] = []
+        self.children: List['_QuadTree'] = []
+    
+    def _child_for(self, box: Tuple[float, float, float, float]) -> Optional['_QuadTree']:
+        """Return the child quadrant that fully contains a box, if any."""
+        for child in self.children:
+            left, top, right, bottom = child.bounds
+            if box[0] >= left and box[1] >= top and box[2] <= right and box[3] <= bottom:
+                return child
+        return None
+    
+    def _split(self) -> None:
+        """Split into four quadrants and push down the boxes they contain."""
+        left, top, right, bottom = self.bounds
+        mid_x = (left + right) / 2
+        mid_y = (top + bottom) / 2
+        level = self.level + 1
+        self.children = [
+            _QuadTree((left, top, mid_x, mid_y), level),
+            _QuadTree((mid_x, top, right, mid_y), level),
+            _QuadTree((left, mid_y, mid_x, bottom), level),
+            _QuadTree((mid_x, mid_y, right, bottom), level)
+        ]
+        
+        boxes = self.boxes
+        self.boxes = []
+        for box in boxes:
+            self.insert(box)
+    
+    def insert(self, box: Tuple[float, float, float, float]) -> None:
+        """Add a box to the tree."""
+        if self.children:
+            child = self._child_for(box)
+            if child is not None:
+                child.insert(box)
+                return
+        
+        self.boxes.append(box)
+        if not self.children and len(self.boxes) > self.max_objects and self.level < self.max_levels:
+            self._split()
+    
+    def intersects(self, box: Tuple[float, float, float, float]) -> bool:
+        """Return whether any box in the tree overlaps the given box."""
+        left, top, right, bottom = box
+        for other in self.boxes:
+            if left < other[2] and other[0] < right and top < other[3] and other[1] < bottom:
+                return True
+        
+        # Only descend into quadrants the box reaches
+        for child in self.children:
+            child_left, child_top, child_right, child_bottom = child.bounds
+            if (left < child_right and child_left < right and
+                    top < child_bottom and child_top < bottom and child.intersects(box)):
+                return True
+        return False
+
 
 @dataclass
 class DeploymentDiagramRenderer(SVGRenderer):
@@ -47,6 +135,12 @@ class DeploymentDiagramRenderer(SVGRenderer):
     line_stroke_width: int = 2
     arrow_size: int = 10
     
+    # Paths beyond this count are drawn as one unlabeled overflow path
+    max_rendered_paths: int = 250
+    
+    # Move nodes down when their artifacts would overlap the node below
+    avoid_overlaps: bool = False
+    
     # Colors
     node_fill: str = "#E8F0FF"
     node_stroke: str = "#2F4F4F"
@@ -55,6 +149,14 @@ class DeploymentDiagramRenderer(SVGRenderer):
     text_color: str = "#000000"
     path_color: str = "#000000"
     
+    # Shape and text markup of each node from earlier renders, keyed by
+    # node ID, with the node content and styling it was built from
+    _fragment_cache: Dict[str, Tuple[Tuple[Any, ...],
+                                     Dict[Tuple[str, str, Optional[float]], List[str]],
+                                     List[str]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    
     def render(self, 
                diagram: DeploymentDiagram, 
                output_path: str, 
@@ -62,6 +164,9 @@ class DeploymentDiagramRenderer(SVGRenderer):
         """
         Render a Deployment Diagram to an SVG file.
         
+        The SVG markup is written directly into a list of string fragments
+        rather than built as svgwrite objects, and joined once when saving.
+        
         Args:
             diagram: The DeploymentDiagram object to render
             output_path: The file path to save the rendered diagram
@@ -71,63 +176,168 @@ class DeploymentDiagramRenderer(SVGRenderer):
             The path to the rendered SVG file
         """
         # Create output directory if it doesn't exist
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        # Create SVG Drawing
-        self.drawing = Drawing(
-            output_path,
-            size=(f"{self.width}{self.unit}", f"{self.height}{self.unit}")
-        )
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        if output_dir not in _created_output_dirs:
+            os.makedirs(output_dir, exist_ok=True)
+            _created_output_dirs.add(output_dir)
+        
+        # Start the SVG document
+        parts = [
+            '<?xml version="1.0" encoding="utf-8" ?>\n'
+            f'<svg baseProfile="full" height="{self.height}{self.unit}" version="1.1" '
+            f'width="{self.width}{self.unit}" xmlns="http://www.w3.org/2000/svg" '
+            'xmlns:ev="http://www.w3.org/2001/xml-events" '
+            'xmlns:xlink="http://www.w3.org/1999/xlink">'
+        ]
         
         # Add definitions
-        self._add_defs()
-        
-        # Create groups for different element types for layering
-        node_group = self.drawing.add(Group(id="nodes"))
-        artifact_group = self.drawing.add(Group(id="artifacts"))
-        path_group = self.drawing.add(Group(id="paths"))
+        self._add_defs(parts)
         
-        # Calculate positions for nodes
+        # Calculate positions for nodes; the grid covers every node, so the
+        # same mapping is used for the nodes and their paths
         positions = self._calculate_positions(diagram)
         
-        # Draw nodes and their artifacts
-        node_positions = {}
+        # Draw nodes and their artifacts. Their shapes are collected by
+        # style and drawn as one path per style below the node text
+        shape_paths: Dict[Tuple[str, str, Optional[float]], List[str]] = {}
+        node_text_parts = []
         for node in diagram.nodes:
-            pos = positions.get(node.id, (50, 50))
-            node_positions[node.id] = pos
-            self._render_node(node_group, node, pos)
+            node_shapes, node_texts = self._node_fragments(node, positions[node.id])
+            for style, path_data in node_shapes.items():
+                shape_paths.setdefault(style, []).extend(path_data)
+            node_text_parts.extend(node_texts)
+        
+        # Shapes default to a 2px stroke and text to the diagram font,
+        # so the layer groups set those once for all their children
+        parts.append('<g font-family="Arial, sans-serif" id="nodes" stroke-width="2" '
+                     'text-anchor="middle">')
+        for (fill, stroke, stroke_width), path_data in shape_paths.items():
+            stroke_width_attr = f'stroke-width="{stroke_width}" ' if stroke_width else ""
+            parts.append(f'<path d="{"".join(path_data)}" fill="{fill}" '
+                         f'stroke="{stroke}" {stroke_width_attr}/>')
+        parts.extend(node_text_parts)
+        parts.append('</g>')
+        
+        # Artifacts are drawn inside their nodes; the layer is kept for
+        # documents that style or script it
+        parts.append('<g id="artifacts" />')
         
         # Draw communication paths
+        parts.append('<g font-family="Arial, sans-serif" id="paths" stroke-width="2" '
+                     'text-anchor="middle">')
+        # Paths connect node centers, so offset each node position once
+        half_width = self.node_width / 2
+        half_height = self.node_height / 2
+        node_centers = {
+            node_id: (x + half_width, y + half_height)
+            for node_id, (x, y) in positions.items()
+        }
+        drawn_paths = []
+        overflow_path_data = []
         for path in diagram.communication_paths:
-            source_pos = node_positions.get(path.source_id)
-            target_pos = node_positions.get(path.target_id)
+            source_pos = node_centers.get(path.source_id)
+            target_pos = node_centers.get(path.target_id)
             
             if source_pos and target_pos:
-                self._render_communication_path(
-                    path_group,
-                    path,
-                    source_pos,
-                    target_pos
-                )
-        
-        # Save the SVG
-        self.drawing.save()
+                if len(drawn_paths) < self.max_rendered_paths:
+                    drawn_paths.append((path, source_pos, target_pos))
+                else:
+                    overflow_path_data.append(
+                        self._overflow_path_data(source_pos, target_pos)
+                    )
+        
+        # Place all path labels in one pass, then emit the markup
+        label_positions = self._path_label_positions(drawn_paths)
+        for (path, source_pos, target_pos), label_pos in zip(drawn_paths, label_positions):
+            self._render_communication_path(
+                parts,
+                path,
+                source_pos,
+                target_pos,
+                label_pos
+            )
+        
+        # Dense diagrams collapse the remaining paths into a single
+        # path without labels or arrows
+        if overflow_path_data:
+            parts.append(
+                f'<g class="overflow-paths"><path d="{"".join(overflow_path_data)}" '
+                f'fill="none" stroke="{self.path_color}" /></g>'
+            )
+        parts.append('</g></svg>')
+        
+        # Save the SVG, recreating the output directory if it was removed
+        # after it was cached
+        svg_content = "".join(parts)
+        try:
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(svg_content)
+        except FileNotFoundError:
+            os.makedirs(output_dir, exist_ok=True)
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(svg_content)
         return output_path
     
-    def _add_defs(self) -> None:
-        """Add definitions to the SVG (markers, patterns, etc.)."""
+    def _add_defs(self, parts: List[str]) -> None:
+        """
+        Add definitions to the SVG (markers, patterns, etc.).
+        
+        Args:
+            parts: The SVG markup fragments to add the definitions to
+        """
         # Add arrow marker for communication paths
-        marker = self.drawing.marker(
-            insert=(10, 5),
-            size=(10, 10),
-            orient="auto",
-            id="arrow"
+        parts.append(
+            '<defs><marker id="arrow" markerHeight="10" markerWidth="10" '
+            'orient="auto" refX="10" refY="5">'
+            f'<path d="M0,0 L10,5 L0,10 L3,5 Z" fill="{self.path_color}" />'
+            '</marker></defs>'
         )
-        marker.add(self.drawing.path(
-            "M0,0 L10,5 L0,10 L3,5 Z",
-            fill=self.path_color
-        ))
-        self.drawing.defs.add(marker)
+    
+    def invalidate(self, node_id: Optional[str] = None) -> None:
+        """
+        Drop cached node markup so it is rebuilt on the next render.
+        
+        Cached markup is already rebuilt when a node's name, type, stereotype,
+        artifacts or position change; this is for other edits made in place.
+        
+        Args:
+            node_id: The node to drop, or None to drop every node
+        """
+        if node_id is None:
+            self._fragment_cache.clear()
+        else:
+            self._fragment_cache.pop(node_id, None)
+    
+    def _node_fragments(self,
+                        node: DeploymentNode,
+                        position: Tuple[int, int]
+                        ) -> Tuple[Dict[Tuple[str, str, Optional[float]], List[str]], List[str]]:
+        """
+        Get the shape and text markup of a node, reusing an earlier render's.
+        
+        Args:
+            node: The DeploymentNode to render
+            position: The (x, y) position to place the node
+            
+        Returns:
+            The node's path data grouped by shape style, and its text markup
+        """
+        cache_key = (
+            node.name, node.stereotype, node.node_type, position,
+            tuple((artifact.id, artifact.name, artifact.stereotype) for artifact in node.artifacts),
+            self.node_width, self.node_height, self.artifact_width, self.artifact_height,
+            self.node_fill, self.node_stroke, self.artifact_fill, self.artifact_stroke,
+            self.text_color
+        )
+        cached = self._fragment_cache.get(node.id)
+        if cached is not None and cached[0] == cache_key:
+            return cached[1], cached[2]
+        
+        shape_paths: Dict[Tuple[str, str, Optional[float]], List[str]] = {}
+        node_texts = []
+        self._render_node(node_texts, shape_paths, node, position)
+        self._fragment_cache[node.id] = (cache_key, shape_paths, node_texts)
+        return shape_paths, node_texts
     
     def _calculate_positions(self, diagram: DeploymentDiagram) -> Dict[str, Tuple[int, int]]:
         """
@@ -142,47 +352,87 @@ class DeploymentDiagramRenderer(SVGRenderer):
         Returns:
             A dictionary mapping node IDs to (x, y) positions
         """
-        positions = {}
+        if not diagram.nodes:
+            return {}
+        
         rows = int(math.ceil(math.sqrt(len(diagram.nodes))))
         cols = int(math.ceil(len(diagram.nodes) / rows))
         
+        # Grid coordinates only depend on the row/column, so compute
+        # each one once rather than once per node
+        xs = [50 + col * (self.node_width + self.node_spacing) for col in range(cols)]
+        ys = [50 + row * (self.node_height + self.node_spacing) for row in range(rows)]
+        
+        # Build the row-major grid cells once and hand them out in node order
+        cells = [(x, y) for y in ys for x in xs]
+        if not self.avoid_overlaps:
+            return {node.id: cells[i] for i, node in enumerate(diagram.nodes)}
+        
+        # Place nodes in grid order, moving each one down a row until its
+        # drawn extent is clear of the nodes placed before it
+        cube_depth = 20
+        step = self.node_height + self.node_spacing
+        extents = [self._node_extent(node) for node in diagram.nodes]
+        placed = _QuadTree((
+            xs[0], ys[0] - cube_depth,
+            xs[-1] + self.node_width + cube_depth, ys[0] + sum(extents) + len(extents) * step
+        ))
+        positions = {}
         for i, node in enumerate(diagram.nodes):
-            row = i // cols
-            col = i % cols
-            
-            x = 50 + col * (self.node_width + self.node_spacing)
-            y = 50 + row * (self.node_height + self.node_spacing)
-            
+            x, y = cells[i]
+            box = (x, y - cube_depth, x + self.node_width + cube_depth, y + extents[i])
+            while placed.intersects(box):
+                y += step
+                box = (box[0], box[1] + step, box[2], box[3] + step)
+            placed.insert(box)
             positions[node.id] = (x, y)
-        
         return positions
     
+    def _node_extent(self, node: DeploymentNode) -> float:
+        """
+        Calculate how far a node's drawing reaches below its position.
+        
+        Args:
+            node: The DeploymentNode to measure
+            
+        Returns:
+            The larger of the node height and the bottom of its last artifact
+        """
+        if not node.artifacts:
+            return self.node_height
+        
+        # Mirrors the text and artifact offsets used by _render_node
+        artifact_y = 65 + (20 if node.stereotype else 0)
+        artifacts_bottom = artifact_y + len(node.artifacts) * (self.artifact_height + 10) - 10
+        return max(self.node_height, artifacts_bottom)
+    
     def _render_node(self,
-                    group: Group,
+                    parts: List[str],
+                    shape_paths: Dict[Tuple[str, str, Optional[float]], List[str]],
                     node: DeploymentNode,
                     position: Tuple[int, int]) -> None:
         """
         Render a node at the specified position.
         
         Args:
-            group: The SVG group to add the node to
+            parts: The SVG markup fragments to add the node's text to
+            shape_paths: The path data to add the node's shapes to, by style
             node: The DeploymentNode object to render
             position: The (x, y) position to place the node
         """
         x, y = position
+        add = parts.append
         
         # Create node cube (3D effect)
         cube_depth = 20
         
+        node_shapes = shape_paths.setdefault((self.node_fill, self.node_stroke, None), [])
+        
         # Front face
-        front = Rect(
-            insert=(x, y),
-            size=(self.node_width, self.node_height),
-            fill=self.node_fill,
-            stroke=self.node_stroke,
-            stroke_width=2
+        node_shapes.append(
+            f"M{_format_number(x)},{_format_number(y)}"
+            f"h{self.node_width}v{self.node_height}h-{self.node_width}Z"
         )
-        group.add(front)
         
         # Top face
         top_points = [
@@ -191,13 +441,7 @@ class DeploymentDiagramRenderer(SVGRenderer):
             (x + self.node_width + cube_depth, y - cube_depth),
             (x + self.node_width, y)
         ]
-        top = Polygon(
-            points=top_points,
-            fill=self.node_fill,
-            stroke=self.node_stroke,
-            stroke_width=2
-        )
-        group.add(top)
+        node_shapes.append(self._polygon_path_data(top_points))
         
         # Right face
         right_points = [
@@ -206,206 +450,257 @@ class DeploymentDiagramRenderer(SVGRenderer):
             (x + self.node_width + cube_depth, y + self.node_height - cube_depth),
             (x + self.node_width, y + self.node_height)
         ]
-        right = Polygon(
-            points=right_points,
-            fill=self.node_fill,
-            stroke=self.node_stroke,
-            stroke_width=2
-        )
-        group.add(right)
+        node_shapes.append(self._polygon_path_data(right_points))
         
-        # Add stereotype if present
+        # Stereotype, name and type indicator share one text element,
+        # one line each
         text_y = y + 25
+        lines = []
         if node.stereotype:
-            stereotype_text = Text(
-                f"«{node.stereotype}»",
-                insert=(x + self.node_width / 2, text_y),
-                fill="#696969",
-                font_family="Arial, sans-serif",
-                font_style="italic",
-                text_anchor="middle"
-            )
-            group.add(stereotype_text)
+            lines.append((f"«{node.stereotype}»", "#696969", "italic", None))
             text_y += 20
-        
-        # Node name
-        name_text = Text(
-            node.name,
-            insert=(x + self.node_width / 2, text_y),
-            fill=self.text_color,
-            font_family="Arial, sans-serif",
-            text_anchor="middle",
-            font_weight="bold"
-        )
-        group.add(name_text)
-        
-        # Node type indicator
+        lines.append((node.name, None, None, "bold"))
         if node.node_type != NodeType.NODE:
-            type_text = Text(
-                f"({node.node_type.name.lower()})",
-                insert=(x + self.node_width / 2, text_y + 20),
-                fill=self.text_color,
-                font_family="Arial, sans-serif",
-                text_anchor="middle",
-                font_style="italic"
-            )
-            group.add(type_text)
+            lines.append((f"({node.node_type.name.lower()})", None, "italic", None))
+        add(self._text_lines_markup(lines, (x + self.node_width / 2, y + 25)))
         
         # Render artifacts
         artifact_y = text_y + 40
         for artifact in node.artifacts:
             self._render_artifact(
-                group,
+                parts,
+                shape_paths,
                 artifact,
                 (x + (self.node_width - self.artifact_width) / 2, artifact_y)
             )
             artifact_y += self.artifact_height + 10
     
     def _render_artifact(self,
-                        group: Group,
+                        parts: List[str],
+                        shape_paths: Dict[Tuple[str, str, Optional[float]], List[str]],
                         artifact: DeploymentArtifact,
                         position: Tuple[int, int]) -> None:
         """
         Render an artifact at the specified position.
         
         Args:
-            group: The SVG group to add the artifact to
+            parts: The SVG markup fragments to add the artifact's text to
+            shape_paths: The path data to add the artifact's shapes to, by style
             artifact: The DeploymentArtifact object to render
             position: The (x, y) position to place the artifact
         """
         x, y = position
+        add = parts.append
+        
+        artifact_shapes = shape_paths.setdefault(
+            (self.artifact_fill, self.artifact_stroke, 1.5), []
+        )
+        fold_lines = shape_paths.setdefault(("none", self.artifact_stroke, 1.5), [])
         
         # Create the main rectangle
-        rect = Rect(
-            insert=(x, y),
-            size=(self.artifact_width, self.artifact_height),
-            fill=self.artifact_fill,
-            stroke=self.artifact_stroke,
-            stroke_width=1.5
+        artifact_shapes.append(
+            f"M{_format_number(x)},{_format_number(y)}"
+            f"h{self.artifact_width}v{self.artifact_height}h-{self.artifact_width}Z"
         )
-        group.add(rect)
         
         # Create the "dog-ear" effect in the top-right corner
         fold_size = 15
-        path_data = f"M {x + self.artifact_width - fold_size} {y} " \
-                    f"L {x + self.artifact_width} {y + fold_size} " \
-                    f"L {x + self.artifact_width} {y} Z"
-        fold = Path(
-            d=path_data,
-            fill=self.artifact_fill,
-            stroke=self.artifact_stroke,
-            stroke_width=1.5
-        )
-        group.add(fold)
+        fold_x = _format_number(x + self.artifact_width - fold_size)
+        right_x = _format_number(x + self.artifact_width)
+        top_y = _format_number(y)
+        fold_y = _format_number(y + fold_size)
+        artifact_shapes.append(f"M{fold_x},{top_y}L{right_x},{fold_y}L{right_x},{top_y}Z")
         
         # Add line for folded corner
-        fold_line = Path(
-            d=f"M {x + self.artifact_width - fold_size} {y} " \
-              f"L {x + self.artifact_width - fold_size} {y + fold_size} " \
-              f"L {x + self.artifact_width} {y + fold_size}",
-            fill="none",
-            stroke=self.artifact_stroke,
-            stroke_width=1.5
-        )
-        group.add(fold_line)
+        fold_lines.append(f"M{fold_x},{top_y}L{fold_x},{fold_y}L{right_x},{fold_y}")
         
-        # Add stereotype if present
-        text_y = y + 20
+        # Stereotype and name share one text element, one line each
+        lines = []
         if artifact.stereotype:
-            stereotype_text = Text(
-                f"«{artifact.stereotype}»",
-                insert=(x + self.artifact_width / 2, text_y),
-                fill="#696969",
-                font_family="Arial, sans-serif",
-                font_style="italic",
-                text_anchor="middle"
-            )
-            group.add(stereotype_text)
-            text_y += 20
+            lines.append((f"«{artifact.stereotype}»", "#696969", "italic", None))
+        lines.append((artifact.name, None, None, "bold"))
+        add(self._text_lines_markup(lines, (x + self.artifact_width / 2, y + 20)))
+    
+    def _path_label_positions(self,
+                              drawn_paths: List[Tuple[CommunicationPath,
+                                                      Tuple[float, float],
+                                                      Tuple[float, float]]]
+                              ) -> List[Optional[Tuple[float, float]]]:
+        """
+        Calculate the label anchor of every drawn communication path.
         
-        # Artifact name
-        name_text = Text(
-            artifact.name,
-            insert=(x + self.artifact_width / 2, text_y),
-            fill=self.text_color,
-            font_family="Arial, sans-serif",
-            text_anchor="middle",
-            font_weight="bold"
-        )
-        group.add(name_text)
+        Labels sit at the path midpoint, offset 15px perpendicular to the
+        line. The geometry is computed in a single loop with locally bound
+        helpers rather than per path while emitting markup.
+        
+        Args:
+            drawn_paths: The (path, source center, target center) of each drawn path
+            
+        Returns:
+            The (x, y) label anchor of each path, or None for unlabeled or
+            zero-length paths
+        """
+        hypot = math.hypot
+        label_positions = []
+        add = label_positions.append
+        for path, (x1, y1), (x2, y2) in drawn_paths:
+            if not (path.name or path.protocol):
+                add(None)
+                continue
+            dx = x2 - x1
+            dy = y2 - y1
+            length = hypot(dx, dy)
+            if length == 0:
+                add(None)
+                continue
+            scale = 15 / length
+            add(((x1 + x2) / 2 - dy * scale, (y1 + y2) / 2 + dx * scale))
+        return label_positions
     
     def _render_communication_path(self,
-                                 group: Group,
+                                 parts: List[str],
                                  path: CommunicationPath,
-                                 start_pos: Tuple[int, int],
-                                 end_pos: Tuple[int, int]) -> None:
+                                 start_pos: Tuple[float, float],
+                                 end_pos: Tuple[float, float],
+                                 label_pos: Optional[Tuple[float, float]] = None) -> None:
         """
         Render a communication path between two nodes.
         
         Args:
-            group: The SVG group to add the path to
+            parts: The SVG markup fragments to add the path to
             path: The CommunicationPath object to render
-            start_pos: The (x, y) position of the source node
-            end_pos: The (x, y) position of the target node
+            start_pos: The (x, y) center of the source node
+            end_pos: The (x, y) center of the target node
+            label_pos: The (x, y) anchor of the path name, or None to draw no labels
         """
         x1, y1 = start_pos
         x2, y2 = end_pos
         
-        # Adjust start and end points to node boundaries
-        x1 += self.node_width / 2
-        y1 += self.node_height / 2
-        x2 += self.node_width / 2
-        y2 += self.node_height / 2
-        
-        # Add line with appropriate style
-        line = Line(
-            start=(x1, y1),
-            end=(x2, y2),
-            stroke=self.path_color,
-            stroke_width=2,
-            marker_end="url(#arrow)"
+        # Add line with appropriate style, with a dashed pattern for
+        # certain communication types
+        dasharray = ""
+        if path.communication_type in [CommunicationType.BUS, CommunicationType.CUSTOM]:
+            dasharray = 'stroke-dasharray="5,3" '
+        parts.append(
+            f'<line marker-end="url(#arrow)" stroke="{self.path_color}" {dasharray}'
+            f'x1="{_format_number(x1)}" x2="{_format_number(x2)}" '
+            f'y1="{_format_number(y1)}" y2="{_format_number(y2)}" />'
         )
         
-        # Add dashed pattern for certain communication types
-        if path.communication_type in [CommunicationType.BUS, CommunicationType.CUSTOM]:
-            line["stroke-dasharray"] = "5,3"
+        # Unlabeled paths have no label position
+        if label_pos is None:
+            return
+        
+        label_x, label_y = label_pos
+        if path.name:
+            parts.append(self._text_markup(
+                path.name,
+                (label_x, label_y),
+                self.text_color,
+                font_size="12px"
+            ))
+        
+        if path.protocol:
+            parts.append(self._text_markup(
+                f"«{path.protocol}»",
+                (label_x, label_y - 15),
+                "#696969",
+                font_size="10px",
+                font_style="italic"
+            ))
+    
+    def _overflow_path_data(self,
+                            start_pos: Tuple[float, float],
+                            end_pos: Tuple[float, float]) -> str:
+        """
+        Build the path data of a straight line between two node centers.
         
-        group.add(line)
+        Args:
+            start_pos: The (x, y) center of the source node
+            end_pos: The (x, y) center of the target node
+            
+        Returns:
+            The path data, to be merged with the other overflow paths
+        """
+        return (
+            f"M{_format_number(start_pos[0])},{_format_number(start_pos[1])}"
+            f"L{_format_number(end_pos[0])},{_format_number(end_pos[1])}"
+        )
+    
+    def _polygon_path_data(self, points: List[Tuple[float, float]]) -> str:
+        """
+        Build the path data of a closed polygon.
         
-        # Add path name and protocol if present
-        if path.name or path.protocol:
-            # Calculate midpoint
-            mid_x = (x1 + x2) / 2
-            mid_y = (y1 + y2) / 2
+        Args:
+            points: The (x, y) corners of the polygon
             
-            # Offset the label perpendicular to the line
-            dx = x2 - x1
-            dy = y2 - y1
-            length = math.sqrt(dx*dx + dy*dy)
-            if length > 0:
-                offset = 15
-                nx = -dy / length * offset
-                ny = dx / length * offset
-                
-                if path.name:
-                    name_text = Text(
-                        path.name,
-                        insert=(mid_x + nx, mid_y + ny),
-                        fill=self.text_color,
-                        font_family="Arial, sans-serif",
-                        font_size="12px",
-                        text_anchor="middle"
-                    )
-                    group.add(name_text)
-                
-                if path.protocol:
-                    protocol_text = Text(
-                        f"«{path.protocol}»",
-                        insert=(mid_x + nx, mid_y + ny - 15),
-                        fill="#696969",
-                        font_family="Arial, sans-serif",
-                        font_style="italic",
-                        font_size="10px",
-                        text_anchor="middle"
-                    )
-                    group.add(protocol_text) 
\ No newline at end of file
+        Returns:
+            The path data, to be merged with other shapes of the same style
+        """
+        return "M" + "L".join(
+            f"{_format_number(px)},{_format_number(py)}" for px, py in points
+        ) + "Z"
+    
+    def _text_markup(self,
+                     text: str,
+                     insert: Tuple[float, float],
+                     fill: str,
+                     font_size: Optional[str] = None,
+                     font_style: Optional[str] = None,
+                     font_weight: Optional[str] = None) -> str:
+        """
+        Build the markup of a text node.
+        
+        The font family and centered anchor are inherited from the layer group.
+        
+        Args:
+            text: The text content
+            insert: The (x, y) position of the text anchor
+            fill: The text color
+            font_size: Optional font size
+            font_style: Optional font style
+            font_weight: Optional font weight
+            
+        Returns:
+            The SVG markup of the text node
+        """
+        attributes = f'fill={quoteattr(fill)} '
+        if font_size:
+            attributes += f'font-size="{font_size}" '
+        if font_style:
+            attributes += f'font-style="{font_style}" '
+        if font_weight:
+            attributes += f'font-weight="{font_weight}" '
+        return (f'<text {attributes}x="{_format_number(insert[0])}" y="{_format_number(insert[1])}">'
+                f'{escape(text)}</text>')
+    
+    def _text_lines_markup(self,
+                           lines: List[Tuple[str, Optional[str], Optional[str], Optional[str]]],
+                           insert: Tuple[float, float]) -> str:
+        """
+        Build the markup of a text node with one tspan per line.
+        
+        Lines are 20px apart and centered on the anchor. Each tspan only
+        carries the attributes that differ from the parent text.
+        
+        Args:
+            lines: The (text, fill, font_style, font_weight) of each line;
+                a fill of None uses the default text color
+            insert: The (x, y) position of the first line's anchor
+            
+        Returns:
+            The SVG markup of the text node
+        """
+        cx = _format_number(insert[0])
+        spans = []
+        for index, (text, fill, font_style, font_weight) in enumerate(lines):
+            attributes = f' dy="20" x="{cx}"' if index else ""
+            if fill:
+                attributes += f' fill={quoteattr(fill)}'
+            if font_style:
+                attributes += f' font-style="{font_style}"'
+            if font_weight:
+                attributes += f' font-weight="{font_weight}"'
+            spans.append(f'<tspan{attributes}>{escape(text)}</tspan>')
+        return (f'<text fill={quoteattr(self.text_color)} x="{cx}" '
+                f'y="{_format_number(insert[1])}">{"".join(spans)}</text>')
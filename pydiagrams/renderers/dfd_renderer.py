@@ -5,8 +5,14 @@ Data Flow Diagram Renderer module for PyDiagrams.
 This module provides a renderer for Data Flow Diagrams (DFD) using Graphviz.
 """
 
+import hashlib
+import json
 import os
-from typing import Dict, List, Optional, Tuple, Any
+import re
+from functools import lru_cache
+from itertools import chain
+from types import MappingProxyType
+from typing import Dict, List, Optional, Set, Tuple, Any
 import graphviz
 
 from pydiagrams.diagrams.entity.dfd import (
@@ -19,195 +25,231 @@ from pydiagrams.diagrams.entity.dfd import (
     ElementType,
     FlowType
 )
+from pydiagrams.renderers.dot_utils import dot_attr_list, dot_quote
+
+# Output directories already created by this module, so batch renders into
+# the same directory only hit the filesystem once
+_created_output_dirs: Set[str] = set()
+
+# Node lines of Graphviz "plain" output: node name x y ...
+_PLAIN_NODE_RE = re.compile(r'^node ("(?:[^"\\]|\\.)*"|\S+) (\S+) (\S+)')
+
+# Default styles for diagram elements
+_ELEMENT_STYLES = MappingProxyType({
+    ElementType.PROCESS: MappingProxyType({
+        'shape': 'ellipse',
+        'style': 'filled',
+        'fillcolor': '#ECECFC',
+        'color': '#9370DB',
+        'fontname': 'Arial',
+        'fontsize': '10'
+    }),
+    ElementType.DATA_STORE: MappingProxyType({
+        'shape': 'box',
+        'style': 'filled',
+        'fillcolor': '#E3F2FD',
+        'color': '#1E88E5',
+        'fontname': 'Arial',
+        'fontsize': '10'
+    }),
+    ElementType.EXTERNAL_ENTITY: MappingProxyType({
+        'shape': 'box',
+        'style': 'filled,rounded',
+        'fillcolor': '#F1F8E9',
+        'color': '#7CB342',
+        'fontname': 'Arial',
+        'fontsize': '10'
+    }),
+    ElementType.TRUST_BOUNDARY: MappingProxyType({
+        'shape': 'box',
+        'style': 'dashed',
+        'color': '#FF5722',
+        'fontname': 'Arial',
+        'fontsize': '10'
+    })
+})
+
+# Default styles for data flow arrows
+_FLOW_STYLES = MappingProxyType({
+    FlowType.DATA: MappingProxyType({
+        'color': '#2196F3',
+        'style': 'solid',
+        'fontname': 'Arial',
+        'fontsize': '8'
+    }),
+    FlowType.CONTROL: MappingProxyType({
+        'color': '#FF5722',
+        'style': 'dashed',
+        'fontname': 'Arial',
+        'fontsize': '8'
+    }),
+    FlowType.EVENT: MappingProxyType({
+        'color': '#9C27B0',
+        'style': 'dotted',
+        'fontname': 'Arial',
+        'fontsize': '8'
+    }),
+    FlowType.RESPONSE: MappingProxyType({
+        'color': '#4CAF50',
+        'style': 'solid',
+        'fontname': 'Arial',
+        'fontsize': '8'
+    }),
+    FlowType.BIDIRECTIONAL: MappingProxyType({
+        'color': '#795548',
+        'style': 'solid',
+        'dir': 'both',
+        'fontname': 'Arial',
+        'fontsize': '8'
+    })
+})
+
+
+# Attribute holding each element type's number
+_NUMBER_ATTRS = {
+    Process: 'process_number',
+    DataStore: 'store_number',
+    ExternalEntity: 'entity_number'
+}
+
+
+@lru_cache(maxsize=4096)
+def _build_label(name: str, number: Optional[str], description: Optional[str]) -> str:
+    """
+    Build a node label from its parts, memoized across renders.
+    
+    Args:
+        name: The element name
+        number: The element number to prefix, if any
+        description: The description to append on a second line, if any
+        
+    Returns:
+        The formatted label
+    """
+    label = name
+    if number:
+        label = f"{number}: {label}"
+    if description:
+        label = f"{label}\\n{description}"
+    return label
 
 
 class DFDRenderer:
     """Renderer for Data Flow Diagrams using Graphviz."""
     
-    def __init__(self, diagram: DataFlowDiagram):
+    def __init__(self, diagram: DataFlowDiagram, engine: str = 'dot', cache_layout: bool = False):
         """
         Initialize the DFD renderer.
         
         Args:
             diagram: The Data Flow Diagram to render
+            engine: The Graphviz layout engine (dot, neato, sfdp, etc.)
+            cache_layout: Whether to keep node positions in a JSON sidecar
+                next to the output and reuse them while the graph is unchanged
         """
         self.diagram = diagram
         self.graph = None
+        self.engine = engine
+        self.cache_layout = cache_layout
         
-        # Default styles for diagram elements
-        self.styles = {
-            ElementType.PROCESS: {
-                'shape': 'ellipse',
-                'style': 'filled',
-                'fillcolor': '#ECECFC',
-                'color': '#9370DB',
-                'fontname': 'Arial',
-                'fontsize': '10'
-            },
-            ElementType.DATA_STORE: {
-                'shape': 'box',
-                'style': 'filled',
-                'fillcolor': '#E3F2FD',
-                'color': '#1E88E5',
-                'fontname': 'Arial',
-                'fontsize': '10'
-            },
-            ElementType.EXTERNAL_ENTITY: {
-                'shape': 'box',
-                'style': 'filled,rounded',
-                'fillcolor': '#F1F8E9',
-                'color': '#7CB342',
-                'fontname': 'Arial',
-                'fontsize': '10'
-            },
-            ElementType.TRUST_BOUNDARY: {
-                'shape': 'box',
-                'style': 'dashed',
-                'color': '#FF5722',
-                'fontname': 'Arial',
-                'fontsize': '10'
-            }
-        }
-        
-        # Default styles for data flow arrows
-        self.flow_styles = {
-            FlowType.DATA: {
-                'color': '#2196F3',
-                'style': 'solid',
-                'fontname': 'Arial',
-                'fontsize': '8'
-            },
-            FlowType.CONTROL: {
-                'color': '#FF5722',
-                'style': 'dashed',
-                'fontname': 'Arial',
-                'fontsize': '8'
-            },
-            FlowType.EVENT: {
-                'color': '#9C27B0',
-                'style': 'dotted',
-                'fontname': 'Arial',
-                'fontsize': '8'
-            },
-            FlowType.RESPONSE: {
-                'color': '#4CAF50',
-                'style': 'solid',
-                'fontname': 'Arial',
-                'fontsize': '8'
-            },
-            FlowType.BIDIRECTIONAL: {
-                'color': '#795548',
-                'style': 'solid',
-                'dir': 'both',
-                'fontname': 'Arial',
-                'fontsize': '8'
-            }
-        }
+        # Style tables are shared, read-only module constants
+        self.styles = _ELEMENT_STYLES
+        self.flow_styles = _FLOW_STYLES
     
     def _setup_graph(self):
-        """Setup the graphviz graph with proper attributes."""
-        self.graph = graphviz.Digraph(
-            name=self.diagram.name,
-            comment=self.diagram.description,
-            format='svg',
-            engine='dot'
-        )
+        """Start the DOT source with the graph, node and edge defaults."""
+        self._lines = []
+        
+        if self.diagram.description:
+            self._lines.extend(f"// {line}" for line in self.diagram.description.splitlines())
+        self._lines.append(f"digraph {dot_quote(self.diagram.name)} {{")
         
-        # Set global graph attributes
-        self.graph.attr(
-            rankdir='LR',
-            splines='polyline',
-            nodesep='0.8',
-            ranksep='1.0',
-            fontname='Arial',
-            fontsize='12',
-            dpi='300',
-            compound='true'  # For boundary boxes
+        # Set global graph attributes; compound is needed for boundary boxes
+        self._lines.append(
+            '\tcompound=true dpi=300 fontname=Arial fontsize=12 nodesep=0.8 '
+            'rankdir=LR ranksep=1.0 splines=polyline'
         )
         
         # Set default node and edge attributes
-        self.graph.attr('node', shape='box', style='filled', fillcolor='white',
-                      fontname='Arial', fontsize='10')
-        self.graph.attr('edge', color='gray', fontname='Arial', fontsize='8')
+        self._lines.append('\tnode [fillcolor=white fontname=Arial fontsize=10 shape=box style=filled]')
+        self._lines.append('\tedge [color=gray fontname=Arial fontsize=8]')
+    
+    def _finish_graph(self):
+        """Close the DOT source and wrap it for Graphviz."""
+        self.graph = graphviz.Source(
+            "\n".join(self._lines) + "\n}\n",
+            format='svg',
+            engine=self.engine
+        )
 
-    def _format_label(self, element, include_number=True, include_description=False):
+    def _format_label(self, element, include_number=True, include_description=False,
+                      number_attr=None):
         """Format the label for a diagram element."""
-        label = element.name
+        number = None
         
-        # Add numbering if available
+        # Add numbering if available; callers that know the element type pass
+        # its number attribute, otherwise it is looked up by type
         if include_number:
-            if hasattr(element, 'process_number') and element.process_number:
-                label = f"{element.process_number}: {label}"
-            elif hasattr(element, 'store_number') and element.store_number:
-                label = f"{element.store_number}: {label}"
-            elif hasattr(element, 'entity_number') and element.entity_number:
-                label = f"{element.entity_number}: {label}"
+            if number_attr is None:
+                number_attr = _NUMBER_ATTRS.get(type(element))
+            if number_attr:
+                number = getattr(element, number_attr, None)
         
         # Add description if requested
-        if include_description and element.description:
-            label = f"{label}\\n{element.description}"
+        description = element.description if include_description else None
         
-        return label
+        return _build_label(element.name, number, description)
 
-    def _render_processes(self):
-        """Render all processes in the diagram."""
-        for process in self.diagram.processes:
-            node_id = process.id
-            label = self._format_label(process)
-            
-            # Apply process-specific styles
-            attrs = self.styles[ElementType.PROCESS].copy()
-            
-            # Add the node to the graph
-            self.graph.node(node_id, label, **attrs)
-
-    def _render_data_stores(self):
-        """Render all data stores in the diagram."""
-        for data_store in self.diagram.data_stores:
-            node_id = data_store.id
+    def _render_all_nodes(self):
+        """Render all processes, data stores and external entities in one pass."""
+        # Element-specific styles are shared by every node of the same type
+        styles = self.styles
+        elements = chain(
+            ((process, styles[ElementType.PROCESS], 'process_number')
+             for process in self.diagram.processes),
+            ((data_store, styles[ElementType.DATA_STORE], 'store_number')
+             for data_store in self.diagram.data_stores),
+            ((entity, styles[ElementType.EXTERNAL_ENTITY], 'entity_number')
+             for entity in self.diagram.external_entities)
+        )
+        attr_lists = {}
+        add = self._lines.append
+        format_label = self._format_label
+        
+        for element, attrs, number_attr in elements:
             # Format data store labels with "DS" prefix if no store number provided
-            if not data_store.store_number:
-                label = f"DS: {data_store.name}"
+            if number_attr == 'store_number' and not element.store_number:
+                label = f"DS: {element.name}"
             else:
-                label = self._format_label(data_store)
+                label = format_label(element, number_attr=number_attr)
             
-            # Apply data store-specific styles
-            attrs = self.styles[ElementType.DATA_STORE].copy()
-            
-            # Add the node to the graph
-            self.graph.node(node_id, label, **attrs)
-
-    def _render_external_entities(self):
-        """Render all external entities in the diagram."""
-        for entity in self.diagram.external_entities:
-            node_id = entity.id
-            label = self._format_label(entity)
-            
-            # Apply external entity-specific styles
-            attrs = self.styles[ElementType.EXTERNAL_ENTITY].copy()
-            
-            # Add the node to the graph
-            self.graph.node(node_id, label, **attrs)
+            # Add the node to the graph, formatting each style's attributes once
+            attr_list = attr_lists.get(id(attrs))
+            if attr_list is None:
+                attr_list = attr_lists[id(attrs)] = dot_attr_list(attrs)
+            add(f"\t{dot_quote(element.id)} [label={dot_quote(label)} {attr_list}]")
 
     def _render_trust_boundaries(self):
         """Render all trust boundaries in the diagram."""
+        attr_list = dot_attr_list(self.styles[ElementType.TRUST_BOUNDARY])
+        
         for boundary in self.diagram.trust_boundaries:
             # Create a subgraph for the trust boundary
-            with self.graph.subgraph(name=f"cluster_{boundary.id}") as subgraph:
-                # Set attributes for the boundary
-                subgraph.attr(
-                    label=boundary.name,
-                    **self.styles[ElementType.TRUST_BOUNDARY]
-                )
-                
-                # Add all elements within this boundary to the subgraph
-                for element_id in boundary.element_ids:
-                    # Just add the element ID to the subgraph
-                    # The actual nodes are already created
-                    subgraph.node(element_id)
+            self._lines.append(f"\tsubgraph {dot_quote(f'cluster_{boundary.id}')} {{")
+            self._lines.append(f"\t\tlabel={dot_quote(boundary.name)} {attr_list}")
+            
+            # Add all elements within this boundary to the subgraph
+            # The actual nodes are already created
+            self._lines.extend(f"\t\t{dot_quote(element_id)}" for element_id in boundary.element_ids)
+            self._lines.append("\t}")
 
     def _render_data_flows(self):
         """Render all data flows in the diagram."""
+        flow_attr_lists = {
+            flow_type: dot_attr_list(attrs) for flow_type, attrs in self.flow_styles.items()
+        }
+        add = self._lines.append
+        
         for flow in self.diagram.data_flows:
             source_id = flow.source_id
             target_id = flow.target_id
@@ -219,11 +261,10 @@ class DFDRenderer:
             else:
                 label = flow.name
             
-            # Apply flow-specific styles
-            attrs = self.flow_styles[flow.flow_type].copy()
-            
-            # Add the edge to the graph
-            self.graph.edge(source_id, target_id, label=label, **attrs)
+            # Add the edge to the graph with the flow-specific styles
+            label_attr = f"label={dot_quote(label)} " if label is not None else ""
+            add(f"\t{dot_quote(source_id)} -> {dot_quote(target_id)} "
+                f"[{label_attr}{flow_attr_lists[flow.flow_type]}]")
 
     def render(self, output_path: str, format: str = "svg", view: bool = False) -> str:
         """
@@ -238,27 +279,106 @@ class DFDRenderer:
             Path to the rendered file
         """
         # Create the directory if it doesn't exist
-        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        if output_dir not in _created_output_dirs:
+            os.makedirs(output_dir, exist_ok=True)
+            _created_output_dirs.add(output_dir)
         
         # Setup the graph
         self._setup_graph()
         
         # Render all diagram elements
-        self._render_processes()
-        self._render_data_stores()
-        self._render_external_entities()
+        self._render_all_nodes()
         self._render_trust_boundaries()
         self._render_data_flows()
+        self._finish_graph()
         
-        # Render the graph to file
-        file_path = self.graph.render(
-            filename=os.path.splitext(output_path)[0],
-            format=format,
-            cleanup=True,
-            view=view
-        )
+        # Reuse the cached layout of an unchanged graph. Clusters are not
+        # kept by the no-op layout, so diagrams with trust boundaries are
+        # always laid out from scratch
+        use_cache = self.cache_layout and not self.diagram.trust_boundaries
+        layout_cache_path = output_path + ".layout.json"
+        # The engine is not part of the source, but the positions depend on it
+        layout_key = hashlib.sha256(f"{self.engine}\n{self.graph.source}".encode("utf-8")).hexdigest()
+        positions = self._load_layout(layout_cache_path, layout_key) if use_cache else None
+        
+        render_options = {}
+        if positions:
+            self._lines.extend(
+                f"\t{dot_quote(node_id)} [pos={dot_quote(pos)}]" for node_id, pos in positions.items()
+            )
+            self._finish_graph()
+            render_options = {'engine': 'neato', 'neato_no_op': 2}
+        
+        # Pipe the source to Graphviz and write the result directly, which
+        # avoids the temporary source file; viewing needs render()
+        if view:
+            file_path = self.graph.render(
+                filename=os.path.splitext(output_path)[0],
+                format=format,
+                cleanup=True,
+                view=view,
+                **render_options
+            )
+        else:
+            file_path = f"{os.path.splitext(output_path)[0]}.{format}"
+            data = self.graph.pipe(format=format, **render_options)
+            # Recreate the output directory if it was removed after it was cached
+            try:
+                with open(file_path, "wb") as f:
+                    f.write(data)
+            except FileNotFoundError:
+                os.makedirs(output_dir, exist_ok=True)
+                with open(file_path, "wb") as f:
+                    f.write(data)
+        
+        if use_cache and not positions:
+            self._save_layout(layout_cache_path, layout_key)
         
         return file_path
+    
+    def _load_layout(self, layout_cache_path: str, layout_key: str) -> Optional[Dict[str, str]]:
+        """
+        Load cached node positions for the current graph.
+        
+        Args:
+            layout_cache_path: Path of the JSON layout sidecar
+            layout_key: Hash of the graph source the positions must belong to
+            
+        Returns:
+            Node positions keyed by node ID, or None if there is no usable cache
+        """
+        try:
+            with open(layout_cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if not isinstance(cached, dict) or cached.get("key") != layout_key:
+            return None
+        return cached.get("positions") or None
+    
+    def _save_layout(self, layout_cache_path: str, layout_key: str) -> None:
+        """
+        Lay out the current graph and save its node positions.
+        
+        Args:
+            layout_cache_path: Path of the JSON layout sidecar
+            layout_key: Hash of the graph source the positions belong to
+        """
+        # The plain format lists each node as "node name x y ..." in inches,
+        # while pinned positions are given in points
+        positions = {}
+        for line in self.graph.pipe(format='plain', encoding='utf-8').splitlines():
+            match = _PLAIN_NODE_RE.match(line)
+            if match:
+                name, x, y = match.groups()
+                if name.startswith('"'):
+                    name = name[1:-1].replace('\\"', '"')
+                positions[name] = f"{float(x) * 72:.2f},{float(y) * 72:.2f}!"
+        
+        with open(layout_cache_path, "w", encoding="utf-8") as f:
+            json.dump({"key": layout_key, "positions": positions}, f)
 
 
 def render_dfd(diagram: DataFlowDiagram, output_path: str, format: str = "svg", view: bool = False) -> str:
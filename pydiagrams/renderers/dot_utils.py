@@ -0,0 +1,46 @@
+"""
+DOT source helpers for PyDiagrams.
+
+This module provides the quoting and attribute formatting shared by the
+renderers that write Graphviz DOT source directly.
+"""
+
+import re
+from typing import Any, Mapping
+
+# A double quote, optionally already escaped, after any escaped backslashes.
+# Like graphviz's own quoting, this treats \" the same as " so an escaped
+# quote is not escaped a second time
+_QUOTE_RE = re.compile(r'((?:\\\\)*)\\?"')
+
+
+def dot_quote(value: Any) -> str:
+    """
+    Quote a DOT identifier or attribute value.
+
+    Backslash escapes such as the "\\n" line breaks in labels are kept, and
+    double quotes are escaped unless they already are.
+
+    Args:
+        value: The value to quote
+
+    Returns:
+        The double-quoted value
+    """
+    text = str(value)
+    if '"' in text:
+        text = _QUOTE_RE.sub(r'\1\\"', text)
+    return '"' + text + '"'
+
+
+def dot_attr_list(attrs: Mapping[str, Any]) -> str:
+    """
+    Format a style mapping as a DOT attribute list.
+
+    Args:
+        attrs: The attribute names and values
+
+    Returns:
+        The space-separated name="value" pairs, sorted by name
+    """
+    return " ".join(f"{name}={dot_quote(value)}" for name, value in sorted(attrs.items()))
@@ -6,9 +6,12 @@ This module provides a renderer for Entity Relationship Diagrams (ERD) using Gra
 """
 
 import os
-from typing import Dict, List, Optional, Tuple, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Optional, Set, Tuple, Any
 import graphviz
 
+from pydiagrams.renderers.dot_utils import dot_attr_list, dot_quote
 from pydiagrams.diagrams.entity.erd import (
     EntityRelationshipDiagram,
     Entity,
@@ -20,9 +23,111 @@ from pydiagrams.diagrams.entity.erd import (
 )
 
 
+# Output directories already created by this module, so batch renders into
+# the same directory only hit the filesystem once
+_created_output_dirs: Set[str] = set()
+
+# Formats that only need the DOT text, not a Graphviz layout
+_SOURCE_FORMATS = frozenset(('dot', 'source', 'gv'))
+
+# Mapping from RelationshipType to edge style
+_RELATIONSHIP_STYLES = MappingProxyType({
+    RelationshipType.ONE_TO_ONE: MappingProxyType({
+        'dir': 'both',
+        'arrowtail': 'tee',
+        'arrowhead': 'tee',
+        'style': 'solid',
+        'color': '#1E88E5'
+    }),
+    RelationshipType.ONE_TO_MANY: MappingProxyType({
+        'dir': 'both',
+        'arrowtail': 'tee',
+        'arrowhead': 'crow',
+        'style': 'solid',
+        'color': '#43A047'
+    }),
+    RelationshipType.MANY_TO_ONE: MappingProxyType({
+        'dir': 'both',
+        'arrowtail': 'crow',
+        'arrowhead': 'tee',
+        'style': 'solid',
+        'color': '#FB8C00'
+    }),
+    RelationshipType.MANY_TO_MANY: MappingProxyType({
+        'dir': 'both',
+        'arrowtail': 'crow',
+        'arrowhead': 'crow',
+        'style': 'solid',
+        'color': '#F44336'
+    }),
+    RelationshipType.INHERITANCE: MappingProxyType({
+        'dir': 'back',
+        'arrowtail': 'empty',
+        'style': 'solid',
+        'color': '#9C27B0'
+    }),
+    RelationshipType.AGGREGATION: MappingProxyType({
+        'dir': 'back',
+        'arrowtail': 'odiamond',
+        'style': 'solid',
+        'color': '#795548'
+    }),
+    RelationshipType.COMPOSITION: MappingProxyType({
+        'dir': 'back',
+        'arrowtail': 'diamond',
+        'style': 'solid',
+        'color': '#607D8B'
+    })
+})
+
+# Style of relationship types without an entry above
+_EMPTY_STYLE = MappingProxyType({})
+
+# Mapping from Cardinality to label text
+_CARDINALITY_LABELS = MappingProxyType({
+    Cardinality.ZERO_OR_ONE: '0..1',
+    Cardinality.EXACTLY_ONE: '1',
+    Cardinality.ZERO_OR_MANY: '0..*',
+    Cardinality.ONE_OR_MANY: '1..*',
+    Cardinality.CUSTOM: 'custom'  # This will be replaced with custom text
+})
+
+# Key icons indexed by (is_primary_key << 1) | is_foreign_key
+_KEY_PREFIXES = ("", "🔗 ", "🔑 ", "🔑🔗 ")
+
+
+@lru_cache(maxsize=1024)
+def _data_type_fragment(data_type: str, length: Optional[int],
+                        precision: Optional[int], scale: Optional[int]) -> str:
+    """
+    Format an attribute data type, shared across attributes with the same type.
+    
+    Args:
+        data_type: The base data type name
+        length: The type length, if any
+        precision: The numeric precision, used when there is no length
+        scale: The numeric scale, used with a precision
+        
+    Returns:
+        The data type, e.g. INT, VARCHAR(255) or DECIMAL(10,2)
+    """
+    # Add length/precision/scale if applicable
+    if length is not None:
+        return f"{data_type}({length})"
+    if precision is not None:
+        if scale is not None:
+            return f"{data_type}({precision},{scale})"
+        return f"{data_type}({precision})"
+    return data_type
+
+
 class ERDRenderer:
     """Renderer for Entity Relationship Diagrams using Graphviz."""
     
+    # Edge styles and cardinality labels are shared, read-only constants
+    relationship_styles = _RELATIONSHIP_STYLES
+    cardinality_labels = _CARDINALITY_LABELS
+    
     def __init__(self, diagram: EntityRelationshipDiagram):
         """
         Initialize the ERD renderer.
@@ -33,116 +138,47 @@ class ERDRenderer:
         self.diagram = diagram
         self.graph = None
         
-        # Mapping from RelationshipType to edge style
-        self.relationship_styles = {
-            RelationshipType.ONE_TO_ONE: {
-                'dir': 'both',
-                'arrowtail': 'tee',
-                'arrowhead': 'tee',
-                'style': 'solid',
-                'color': '#1E88E5'
-            },
-            RelationshipType.ONE_TO_MANY: {
-                'dir': 'both',
-                'arrowtail': 'tee',
-                'arrowhead': 'crow',
-                'style': 'solid',
-                'color': '#43A047'
-            },
-            RelationshipType.MANY_TO_ONE: {
-                'dir': 'both',
-                'arrowtail': 'crow',
-                'arrowhead': 'tee',
-                'style': 'solid',
-                'color': '#FB8C00'
-            },
-            RelationshipType.MANY_TO_MANY: {
-                'dir': 'both',
-                'arrowtail': 'crow',
-                'arrowhead': 'crow',
-                'style': 'solid',
-                'color': '#F44336'
-            },
-            RelationshipType.INHERITANCE: {
-                'dir': 'back',
-                'arrowtail': 'empty',
-                'style': 'solid',
-                'color': '#9C27B0'
-            },
-            RelationshipType.AGGREGATION: {
-                'dir': 'back',
-                'arrowtail': 'odiamond',
-                'style': 'solid',
-                'color': '#795548'
-            },
-            RelationshipType.COMPOSITION: {
-                'dir': 'back',
-                'arrowtail': 'diamond',
-                'style': 'solid',
-                'color': '#607D8B'
-            }
-        }
-        
-        # Mapping from Cardinality to label text
-        self.cardinality_labels = {
-            Cardinality.ZERO_OR_ONE: '0..1',
-            Cardinality.EXACTLY_ONE: '1',
-            Cardinality.ZERO_OR_MANY: '0..*',
-            Cardinality.ONE_OR_MANY: '1..*',
-            Cardinality.CUSTOM: 'custom'  # This will be replaced with custom text
-        }
+        # Entity lookup built for the duration of a render
+        self._entity_by_id = {}
     
     def _setup_graph(self):
-        """Setup the graphviz graph with proper attributes."""
-        self.graph = graphviz.Digraph(
-            name=self.diagram.name,
-            comment=self.diagram.description,
-            format='svg',
-            engine='dot'
-        )
+        """Start the DOT source with the graph, node and edge defaults."""
+        self._lines = []
+        
+        if self.diagram.description:
+            self._lines.extend(f"// {line}" for line in self.diagram.description.splitlines())
+        self._lines.append(f"digraph {dot_quote(self.diagram.name)} {{")
         
         # Set global graph attributes
-        self.graph.attr(
-            rankdir='LR',
-            splines='ortho',
-            nodesep='0.8',
-            ranksep='1.0',
-            fontname='Arial',
-            fontsize='12',
-            dpi='300'
+        self._lines.append(
+            '\tdpi=300 fontname=Arial fontsize=12 nodesep=0.8 rankdir=LR ranksep=1.0 splines=ortho'
         )
         
         # Set default node and edge attributes
-        self.graph.attr('node', shape='plain', fontname='Arial', fontsize='10')
-        self.graph.attr('edge', fontname='Arial', fontsize='9')
+        self._lines.append('\tnode [fontname=Arial fontsize=10 shape=plain]')
+        self._lines.append('\tedge [fontname=Arial fontsize=9]')
+    
+    def _finish_graph(self):
+        """Close the DOT source and wrap it for Graphviz."""
+        self.graph = graphviz.Source(
+            "\n".join(self._lines) + "\n}\n",
+            format='svg',
+            engine='dot'
+        )
 
     def _format_attribute_label(self, attr: Attribute) -> str:
         """Format an attribute for display in the entity table."""
         # Start with icons for primary/foreign keys
-        prefix = ""
-        if attr.is_primary_key and attr.is_foreign_key:
-            prefix = "🔑🔗 "
-        elif attr.is_primary_key:
-            prefix = "🔑 "
-        elif attr.is_foreign_key:
-            prefix = "🔗 "
+        prefix = _KEY_PREFIXES[bool(attr.is_primary_key) << 1 | bool(attr.is_foreign_key)]
         
         # Add attribute name
         label = f"{prefix}{attr.name}"
         
         # Add data type if provided
         if attr.data_type:
-            data_type = attr.data_type
-            
-            # Add length/precision/scale if applicable
-            if attr.length is not None:
-                data_type = f"{data_type}({attr.length})"
-            elif attr.precision is not None:
-                if attr.scale is not None:
-                    data_type = f"{data_type}({attr.precision},{attr.scale})"
-                else:
-                    data_type = f"{data_type}({attr.precision})"
-            
+            data_type = _data_type_fragment(
+                attr.data_type, attr.length, attr.precision, attr.scale
+            )
             label = f"{label} : {data_type}"
         
         # Add nullability indicator
@@ -159,51 +195,57 @@ class ERDRenderer:
         """Render an entity as an HTML-like table."""
         entity_id = entity.id
         
-        # Start building the HTML-like label for the entity
-        label = '<<TABLE BORDER="0" CELLBORDER="1" CELLSPACING="0" CELLPADDING="4">'
+        # Build the HTML-like label for the entity from a list of rows
+        parts = ['<<TABLE BORDER="0" CELLBORDER="1" CELLSPACING="0" CELLPADDING="4">']
         
         # Entity name header (with different background for weak entities)
         bg_color = "#ECECFC" if not entity.is_weak else "#FFF9C4"
         
         # Entity name row (header)
-        label += f'<TR><TD BGCOLOR="{bg_color}" COLSPAN="1"><B>{entity.name}</B></TD></TR>'
+        parts.append(f'<TR><TD BGCOLOR="{bg_color}" COLSPAN="1"><B>{entity.name}</B></TD></TR>')
         
         # Attribute rows
         for attr in entity.attributes:
             attr_label = self._format_attribute_label(attr)
-            label += f'<TR><TD ALIGN="LEFT" PORT="{attr.id}">{attr_label}</TD></TR>'
+            parts.append(f'<TR><TD ALIGN="LEFT" PORT="{attr.id}">{attr_label}</TD></TR>')
         
         # Close the table
-        label += '</TABLE>>'
-        
-        # Set additional node attributes
-        node_attrs = {
-            'label': label,
-            'style': 'filled',
-            'fillcolor': 'white',
-            'color': '#333333' if not entity.is_weak else '#FFB300'
-        }
+        parts.append('</TABLE>>')
+        label = ''.join(parts)
         
-        # Add dashed border for weak entities
+        # Set additional node attributes, with a dashed border for weak entities
         if entity.is_weak:
-            node_attrs['style'] = 'filled,dashed'
+            node_attrs = 'color="#FFB300" fillcolor="white" style="filled,dashed"'
+        else:
+            node_attrs = 'color="#333333" fillcolor="white" style="filled"'
         
-        # Add the entity to the graph
-        self.graph.node(entity_id, **node_attrs)
+        # Add the entity to the graph; the HTML-like label is not quoted
+        self._lines.append(f"\t{dot_quote(entity_id)} [label={label} {node_attrs}]")
 
-    def _get_cardinality_label(self, rel: EntityRelationship, end: str) -> str:
-        """Get the cardinality label for a relationship end."""
-        if end == 'source':
-            cardinality = rel.source_cardinality
-            custom_cardinality = rel.custom_source_cardinality
-        else:  # target
-            cardinality = rel.target_cardinality
-            custom_cardinality = rel.custom_target_cardinality
-        
-        if cardinality == Cardinality.CUSTOM and custom_cardinality:
-            return custom_cardinality
+    def _get_end_labels(self, rel: EntityRelationship) -> Tuple[str, str]:
+        """Get the tail (source) and head (target) labels of a relationship."""
+        cardinality_labels = self.cardinality_labels
+        
+        # Cardinality of each end, with custom text when provided
+        source_cardinality = rel.source_cardinality
+        if source_cardinality == Cardinality.CUSTOM and rel.custom_source_cardinality:
+            tail = rel.custom_source_cardinality
+        else:
+            tail = cardinality_labels.get(source_cardinality, '')
+        
+        target_cardinality = rel.target_cardinality
+        if target_cardinality == Cardinality.CUSTOM and rel.custom_target_cardinality:
+            head = rel.custom_target_cardinality
         else:
-            return self.cardinality_labels.get(cardinality, '')
+            head = cardinality_labels.get(target_cardinality, '')
+        
+        # Append role names if provided
+        if rel.source_role:
+            tail = f"{tail} ({rel.source_role})"
+        if rel.target_role:
+            head = f"{head} ({rel.target_role})"
+        
+        return tail, head
 
     def _render_relationship(self, rel: EntityRelationship):
         """Render a relationship as an edge between entities."""
@@ -211,43 +253,40 @@ class ERDRenderer:
         target_id = rel.target_entity_id
         
         # Get the source and target entities
-        source_entity = self.diagram.find_entity_by_id(source_id)
-        target_entity = self.diagram.find_entity_by_id(target_id)
+        source_entity = self._entity_by_id.get(source_id)
+        target_entity = self._entity_by_id.get(target_id)
         
         if not source_entity or not target_entity:
             # Skip if either entity is not found
             return
         
-        # Get the relationship style based on type
-        edge_attrs = self.relationship_styles.get(rel.relationship_type, {}).copy()
+        # Get the relationship style based on type; it is shared, so the
+        # per-edge attributes go into a separate overlay
+        base_attrs = self.relationship_styles.get(rel.relationship_type, _EMPTY_STYLE)
+        edge_attrs = {}
         
         # Add relationship name as a label if provided
         if rel.name:
             edge_attrs['label'] = rel.name
         
-        # Add cardinality labels
-        source_cardinality = self._get_cardinality_label(rel, 'source')
-        target_cardinality = self._get_cardinality_label(rel, 'target')
-        
-        if source_cardinality:
-            edge_attrs['taillabel'] = source_cardinality
+        # Add cardinality and role labels
+        tail_label, head_label = self._get_end_labels(rel)
         
-        if target_cardinality:
-            edge_attrs['headlabel'] = target_cardinality
+        if tail_label:
+            edge_attrs['taillabel'] = tail_label
         
-        # Add role names if provided
-        if rel.source_role:
-            edge_attrs['taillabel'] = f"{edge_attrs.get('taillabel', '')} ({rel.source_role})"
-        
-        if rel.target_role:
-            edge_attrs['headlabel'] = f"{edge_attrs.get('headlabel', '')} ({rel.target_role})"
+        if head_label:
+            edge_attrs['headlabel'] = head_label
         
         # Add identifying relationship style
         if rel.identifying:
-            edge_attrs['style'] = f"{edge_attrs.get('style', 'solid')},bold"
+            edge_attrs['style'] = f"{base_attrs.get('style', 'solid')},bold"
         
-        # Add the edge to the graph
-        self.graph.edge(source_id, target_id, **edge_attrs)
+        # Add the edge to the graph, only merging when there are overrides
+        attrs = {**base_attrs, **edge_attrs} if edge_attrs else base_attrs
+        self._lines.append(
+            f"\t{dot_quote(source_id)} -> {dot_quote(target_id)} [{dot_attr_list(attrs)}]"
+        )
 
     def render(self, output_path: str, format: str = "svg", view: bool = False) -> str:
         """
@@ -255,18 +294,25 @@ class ERDRenderer:
         
         Args:
             output_path: Path where to save the rendered diagram
-            format: Output format (svg, png, pdf, etc.)
+            format: Output format (svg, png, pdf, etc.); 'dot', 'source' and
+                'gv' write the DOT source without running Graphviz
             view: Whether to open the rendered diagram
             
         Returns:
             Path to the rendered file
         """
         # Create the directory if it doesn't exist
-        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        if output_dir not in _created_output_dirs:
+            os.makedirs(output_dir, exist_ok=True)
+            _created_output_dirs.add(output_dir)
         
         # Setup the graph
         self._setup_graph()
         
+        # Index entities once so relationships don't scan the entity list
+        self._entity_by_id = {entity.id: entity for entity in self.diagram.entities}
+        
         # Render all entities
         for entity in self.diagram.entities:
             self._render_entity(entity)
@@ -274,6 +320,21 @@ class ERDRenderer:
         # Render all relationships
         for relationship in self.diagram.relationships:
             self._render_relationship(relationship)
+        self._finish_graph()
+        self._entity_by_id = {}
+        
+        # Write the DOT source directly when no layout is needed
+        if format in _SOURCE_FORMATS:
+            file_path = os.path.splitext(output_path)[0] + '.dot'
+            # Recreate the output directory if it was removed after it was cached
+            try:
+                with open(file_path, "w", encoding="utf-8") as f:
+                    f.write(self.graph.source)
+            except FileNotFoundError:
+                os.makedirs(output_dir, exist_ok=True)
+                with open(file_path, "w", encoding="utf-8") as f:
+                    f.write(self.graph.source)
+            return file_path
         
         # Render the graph to file
         file_path = self.graph.render(
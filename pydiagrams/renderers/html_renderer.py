@@ -3,10 +3,11 @@ HTML renderer for Mermaid diagrams.
 """
 
 import os
+import re
 import sys
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Set, Tuple, Union
 
 THEMES = [
     "default", 
@@ -17,6 +18,50 @@ THEMES = [
     "high-contrast"
 ]
 
+# Output directories already created by this module, so batch renders into
+# the same directory only hit the filesystem once
+_created_output_dirs: Set[str] = set()
+
+# Directory holding the bundled HTML templates and resources
+_TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+# Template and resource texts already read by any renderer, keyed by path,
+# with None for missing files; the bundled files don't change while the
+# process runs
+_file_cache: Dict[str, Optional[str]] = {}
+
+# Write buffer for HTML output, large enough that pages with inlined
+# resources go out in a few write calls instead of many 8KB ones
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Placeholders of the form {{name}} in the HTML templates
+_PLACEHOLDER_RE = re.compile(r'\{\{(\w+)\}\}')
+
+# Templates split around their content placeholder, keyed by path and placeholder
+_template_parts_cache: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+
+def _read_cached(path: Path) -> Optional[str]:
+    """
+    Read a template or resource file once per process.
+    
+    Args:
+        path: Path of the file to read
+        
+    Returns:
+        Optional[str]: Content of the file, or None if it doesn't exist
+    """
+    key = str(path)
+    if key not in _file_cache:
+        try:
+            content = path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            content = None
+        _file_cache[key] = content
+    
+    return _file_cache[key]
+
+
 class HTMLRenderer:
     """Renderer for diagrams in HTML format with themes and interactive features."""
     
@@ -44,8 +89,13 @@ class HTMLRenderer:
         self.dark_mode = dark_mode
         self.inline_resources = inline_resources
         
+        # Placeholder values that do not change between renders
+        self._dark_mode_str = str(dark_mode).lower()
+        self._width_str = str(width)
+        self._height_str = str(height)
+        
         # Get templates directory
-        self.templates_dir = Path(__file__).parent / "templates"
+        self.templates_dir = _TEMPLATES_DIR
         
         if not self.templates_dir.exists():
             raise FileNotFoundError(f"Templates directory not found: {self.templates_dir}")
@@ -62,11 +112,33 @@ class HTMLRenderer:
         """
         template_path = self.templates_dir / template_name
         
-        if not template_path.exists():
+        # Read each template once per process
+        template = _read_cached(template_path)
+        if template is None:
             raise FileNotFoundError(f"Template not found: {template_path}")
         
-        with open(template_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        return template
+    
+    def get_template_parts(self, template_name: str, placeholder: str) -> Tuple[str, str]:
+        """
+        Get the parts of a template before and after a placeholder.
+        
+        Args:
+            template_name: Name of the template file
+            placeholder: Placeholder to split the template at
+            
+        Returns:
+            Tuple[str, str]: Template content before and after the placeholder
+        """
+        key = (str(self.templates_dir / template_name), placeholder)
+        
+        # Split each template once per process
+        parts = _template_parts_cache.get(key)
+        if parts is None:
+            head, _, tail = self.get_template(template_name).partition(placeholder)
+            parts = _template_parts_cache[key] = (head, tail)
+        
+        return parts
     
     def inject_resources(self, html_content: str) -> str:
         """
@@ -82,34 +154,28 @@ class HTMLRenderer:
             return html_content
             
         # Read CSS file
-        css_path = self.templates_dir / "themes.css"
-        if css_path.exists():
-            with open(css_path, 'r', encoding='utf-8') as f:
-                css_content = f.read()
-                html_content = html_content.replace(
-                    '<link rel="stylesheet" href="themes.css">',
-                    f'<style>{css_content}</style>'
-                )
+        css_content = _read_cached(self.templates_dir / "themes.css")
+        if css_content is not None:
+            html_content = html_content.replace(
+                '<link rel="stylesheet" href="themes.css">',
+                f'<style>{css_content}</style>'
+            )
         
         # Read JS file
-        js_path = self.templates_dir / "themes.js"
-        if js_path.exists():
-            with open(js_path, 'r', encoding='utf-8') as f:
-                js_content = f.read()
-                html_content = html_content.replace(
-                    '<script src="themes.js"></script>',
-                    f'<script>{js_content}</script>'
-                )
+        js_content = _read_cached(self.templates_dir / "themes.js")
+        if js_content is not None:
+            html_content = html_content.replace(
+                '<script src="themes.js"></script>',
+                f'<script>{js_content}</script>'
+            )
                 
         # Read Mermaid JS
-        mermaid_js_path = self.templates_dir / "mermaid.min.js"
-        if mermaid_js_path.exists():
-            with open(mermaid_js_path, 'r', encoding='utf-8') as f:
-                mermaid_js_content = f.read()
-                html_content = html_content.replace(
-                    '<script src="https://cdn.jsdelivr.net/npm/mermaid/dist/mermaid.min.js"></script>',
-                    f'<script>{mermaid_js_content}</script>'
-                )
+        mermaid_js_content = _read_cached(self.templates_dir / "mermaid.min.js")
+        if mermaid_js_content is not None:
+            html_content = html_content.replace(
+                '<script src="https://cdn.jsdelivr.net/npm/mermaid/dist/mermaid.min.js"></script>',
+                f'<script>{mermaid_js_content}</script>'
+            )
         
         return html_content
     
@@ -127,11 +193,11 @@ class HTMLRenderer:
         if diagram_data['type'] != 'mermaid':
             raise ValueError(f"HTML renderer only supports Mermaid diagrams, got {diagram_data['type']}")
         
-        # Get base HTML template
-        base_template = self.get_template("base.html")
+        # Get base HTML template, split around the body content
+        html_head, html_tail = self.get_template_parts("base.html", "{{body_content}}")
         
-        # Get mermaid template
-        mermaid_template = self.get_template("mermaid.html")
+        # Get mermaid template, split around the diagram content
+        mermaid_head, mermaid_tail = self.get_template_parts("mermaid.html", "{{diagram_content}}")
         
         # Set diagram content
         diagram_content = diagram_data['raw_content']
@@ -139,36 +205,50 @@ class HTMLRenderer:
         # Get diagram title
         title = diagram_data.get('title', 'Mermaid Diagram')
         
-        # Apply template
-        mermaid_html = mermaid_template.replace("{{diagram_content}}", diagram_content)
-        
         # Apply theme if specified
         theme = diagram_data.get('theme', 'default')
         if theme not in THEMES:
             print(f"Warning: Theme '{theme}' not found, using default theme instead")
             theme = 'default'
         
-        # Replace theme and dark mode placeholders
-        html_content = base_template.replace("{{title}}", title)
-        html_content = html_content.replace("{{body_content}}", mermaid_html)
-        html_content = html_content.replace("{{theme}}", theme)
-        html_content = html_content.replace("{{dark_mode}}", str(self.dark_mode).lower())
+        # Fill the title, theme, dark mode and size placeholders in one pass
+        # over each part. The body is written separately below, so the
+        # diagram content is never copied through the substitution or
+        # resource injection
+        values = {
+            'title': title,
+            'theme': theme,
+            'dark_mode': self._dark_mode_str,
+            'width': self._width_str,
+            'height': self._height_str,
+        }
+        
+        def fill(match):
+            return values.get(match.group(1), match.group(0))
         
-        # Create width and height styles
-        html_content = html_content.replace("{{width}}", str(self.width))
-        html_content = html_content.replace("{{height}}", str(self.height))
+        html_head = _PLACEHOLDER_RE.sub(fill, html_head)
+        html_tail = _PLACEHOLDER_RE.sub(fill, html_tail)
         
         # Inject resources if requested
         if self.inline_resources:
-            html_content = self.inject_resources(html_content)
+            html_head = self.inject_resources(html_head)
+            html_tail = self.inject_resources(html_tail)
         
         # Create output directory if it doesn't exist
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-        
-        # Write to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        if output_dir not in _created_output_dirs:
+            os.makedirs(output_dir, exist_ok=True)
+            _created_output_dirs.add(output_dir)
+        
+        # Stream the document to the file piece by piece, recreating the
+        # output directory if it was removed after it was cached
+        pieces = (html_head, mermaid_head, diagram_content, mermaid_tail, html_tail)
+        try:
+            with open(output_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+                f.writelines(pieces)
+        except FileNotFoundError:
+            os.makedirs(output_dir, exist_ok=True)
+            with open(output_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+                f.writelines(pieces)
         
         return output_path 
\ No newline at end of file
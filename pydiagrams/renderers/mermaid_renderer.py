@@ -4,10 +4,47 @@ Mermaid renderer for SVG and PNG output.
 
 import os
 import sys
+import shutil
 import tempfile
 import subprocess
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+
+@lru_cache(maxsize=None)
+def _mmdc_installed() -> bool:
+    """
+    Check if mmdc (Mermaid CLI) is on the PATH, once per process.
+    
+    The warning about the fallback renderer is printed on the first check
+    only, so creating many renderers doesn't repeat it.
+    
+    Returns:
+        bool: True if mmdc is available, False otherwise
+    """
+    if shutil.which('mmdc') is not None:
+        return True
+    
+    print("Warning: 'mmdc' (Mermaid CLI) not found. Using fallback renderer.", file=sys.stderr)
+    print("For best results, install the Mermaid CLI with: npm install -g @mermaid-js/mermaid-cli", file=sys.stderr)
+    return False
+
+
+def _has_block_fence(diagram_content: str) -> bool:
+    """
+    Check if Mermaid content could end the Markdown code block it is put in.
+    
+    Besides ``` fences, mmdc's Markdown parser also ends a block at :::,
+    which Mermaid uses for class shorthands such as ``A:::highlight``.
+    
+    Args:
+        diagram_content: Mermaid diagram content
+        
+    Returns:
+        bool: True if the content contains ``` or :::
+    """
+    return '```' in diagram_content or ':::' in diagram_content
 
 
 class MermaidRenderer:
@@ -17,10 +54,6 @@ class MermaidRenderer:
         """Initialize the Mermaid renderer."""
         # Check if mmdc (Mermaid CLI) is installed
         self.has_mmdc = self._check_mmdc_installed()
-        
-        if not self.has_mmdc:
-            print("Warning: 'mmdc' (Mermaid CLI) not found. Using fallback renderer.", file=sys.stderr)
-            print("For best results, install the Mermaid CLI with: npm install -g @mermaid-js/mermaid-cli", file=sys.stderr)
     
     def _check_mmdc_installed(self) -> bool:
         """
@@ -29,14 +62,7 @@ class MermaidRenderer:
         Returns:
             bool: True if mmdc is available, False otherwise
         """
-        try:
-            subprocess.run(['mmdc', '--version'], 
-                          stdout=subprocess.PIPE, 
-                          stderr=subprocess.PIPE,
-                          check=False)
-            return True
-        except FileNotFoundError:
-            return False
+        return _mmdc_installed()
     
     def render(self, diagram_data: Dict[str, Any], output_path: str, output_format: str = 'svg') -> str:
         """
@@ -66,45 +92,114 @@ class MermaidRenderer:
         else:
             return self._render_fallback(diagram_content, output_path, output_format)
     
-    def _render_with_mmdc(self, diagram_content: str, output_path: str, output_format: str) -> str:
+    def render_many(self, diagrams: List[Tuple[Dict[str, Any], str]], output_format: str = 'svg') -> List[str]:
         """
-        Render a Mermaid diagram using the Mermaid CLI.
+        Render several Mermaid diagrams to SVG or PNG.
+        
+        With the Mermaid CLI, all diagrams go through a single mmdc run (as the
+        code blocks of one Markdown file), so its browser starts only once
+        instead of once per diagram.
         
         Args:
-            diagram_content: Mermaid diagram content
-            output_path: Path to save the rendered diagram
+            diagrams: (diagram_data, output_path) pairs to render
             output_format: Output format ('svg' or 'png')
             
         Returns:
-            str: Path to the rendered diagram
+            List[str]: Paths to the rendered diagrams, in input order
         """
-        # Create a temporary file for the Mermaid content
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.mmd', delete=False) as temp_file:
-            temp_file.write(diagram_content)
-            temp_path = temp_file.name
+        if not self.has_mmdc or len(diagrams) < 2:
+            return self._render_each(diagrams, output_format)
+        
+        for diagram_data, output_path in diagrams:
+            if diagram_data['type'] != 'mermaid':
+                raise ValueError(f"Mermaid renderer only supports Mermaid diagrams, got {diagram_data['type']}")
+            
+            # Create output directory if it doesn't exist
+            output_dir = os.path.dirname(output_path)
+            if output_dir and not os.path.exists(output_dir):
+                os.makedirs(output_dir)
+        
+        # mmdc ends a Markdown code block at the first ``` or ::: in it, so
+        # diagrams containing either are rendered one at a time
+        if any(_has_block_fence(diagram_data['raw_content']) for diagram_data, _ in diagrams):
+            return self._render_each(diagrams, output_format)
         
-        try:
-            # Run mmdc
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # One Markdown file with a mermaid code block per diagram
+            source_path = os.path.join(temp_dir, 'diagrams.md')
+            with open(source_path, 'w', encoding='utf-8') as f:
+                for diagram_data, _ in diagrams:
+                    f.write(f"```mermaid\n{diagram_data['raw_content']}\n```\n\n")
+            
+            # mmdc writes the image of the n-th block to rendered-<n>.<format>
             cmd = [
                 'mmdc',
-                '-i', temp_path,
-                '-o', output_path,
+                '-i', source_path,
+                '-o', os.path.join(temp_dir, 'rendered.md'),
+                '-e', output_format,
                 '-t', 'default',  # TODO: Add support for themes
                 '-b', 'transparent'
             ]
+            subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             
-            if output_format == 'png':
-                cmd.extend(['-p'])
+            # Only trust the numbering if there is exactly one image per diagram
+            rendered_paths = [os.path.join(temp_dir, f"rendered-{index}.{output_format}")
+                              for index in range(1, len(diagrams) + 1)]
+            rendered_count = sum(1 for name in os.listdir(temp_dir)
+                                 if name.startswith('rendered-') and name.endswith(f".{output_format}"))
+            if rendered_count != len(diagrams) or not all(map(os.path.exists, rendered_paths)):
+                print(f"Warning: mmdc rendered {rendered_count} images for {len(diagrams)} diagrams. "
+                      "Rendering them one at a time.", file=sys.stderr)
+                return self._render_each(diagrams, output_format)
             
-            subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            for rendered_path, (_, output_path) in zip(rendered_paths, diagrams):
+                shutil.move(rendered_path, output_path)
+        
+        return [output_path for _, output_path in diagrams]
+    
+    def _render_each(self, diagrams: List[Tuple[Dict[str, Any], str]], output_format: str) -> List[str]:
+        """
+        Render several Mermaid diagrams with one render call each.
+        
+        Args:
+            diagrams: (diagram_data, output_path) pairs to render
+            output_format: Output format ('svg' or 'png')
             
-            return output_path
-        finally:
-            # Clean up the temporary file
-            try:
-                os.unlink(temp_path)
-            except Exception:
-                pass
+        Returns:
+            List[str]: Paths to the rendered diagrams, in input order
+        """
+        return [self.render(diagram_data, output_path, output_format)
+                for diagram_data, output_path in diagrams]
+    
+    def _render_with_mmdc(self, diagram_content: str, output_path: str, output_format: str) -> str:
+        """
+        Render a Mermaid diagram using the Mermaid CLI.
+        
+        Args:
+            diagram_content: Mermaid diagram content
+            output_path: Path to save the rendered diagram
+            output_format: Output format ('svg' or 'png')
+            
+        Returns:
+            str: Path to the rendered diagram
+        """
+        # Run mmdc, passing the Mermaid content on stdin instead of through
+        # a temporary file
+        cmd = [
+            'mmdc',
+            '-i', '-',
+            '-o', output_path,
+            '-t', 'default',  # TODO: Add support for themes
+            '-b', 'transparent'
+        ]
+        
+        if output_format == 'png':
+            cmd.extend(['-p'])
+        
+        subprocess.run(cmd, input=diagram_content.encode('utf-8'), check=True,
+                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        
+        return output_path
     
     def _render_fallback(self, diagram_content: str, output_path: str, output_format: str) -> str:
         """
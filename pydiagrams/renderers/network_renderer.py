@@ -6,15 +6,19 @@ This module provides specialized rendering for Network Diagrams,
 visualizing network devices, connections, and zones.
 """
 
+import io
 import math
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List, Optional, Set, Tuple, Any, Union
+from xml.sax.saxutils import escape, quoteattr
 
 from svgwrite import Drawing
 from svgwrite.container import Group
 from svgwrite.shapes import Line, Rect, Circle, Polygon, Ellipse
-from svgwrite.text import Text
+from svgwrite.text import Text, TSpan
 from svgwrite.path import Path
 
 from pydiagrams.diagrams.architectural.network_diagram import (
@@ -23,6 +27,100 @@ from pydiagrams.diagrams.architectural.network_diagram import (
 )
 from pydiagrams.renderers.svg_renderer import SVGRenderer
 
+# Dash pattern for each connection type; other types are drawn solid
+_DASH_BY_CONNECTION = MappingProxyType({
+    ConnectionType.WIRELESS: "5,3",
+    ConnectionType.VPN: "10,5"
+})
+
+# Marker and device symbol definitions written in text mode. They are the
+# same for every diagram, so they are kept as markup rather than rebuilt
+# from svgwrite elements (see _add_defs) on each render
+_DEFS_MARKUP = (
+    '<defs>'
+    '<marker id="arrow" markerHeight="10" markerWidth="10" orient="auto" refX="10" refY="5">'
+    '<path d="M0,0 L10,5 L0,10 L3,5 Z" fill="#000000" />'
+    '</marker>'
+    '<symbol id="router" viewBox="0 0 60 60">'
+    '<rect fill="#FFECB3" height="30" rx="2" ry="2" stroke="#333333" stroke-width="2" '
+    'width="50" x="5" y="10" />'
+    '<circle cx="15" cy="45" fill="#333333" r="3" />'
+    '<circle cx="30" cy="45" fill="#333333" r="3" />'
+    '<circle cx="45" cy="45" fill="#333333" r="3" />'
+    '</symbol>'
+    '<symbol id="switch" viewBox="0 0 60 60">'
+    '<rect fill="#C8E6C9" height="20" rx="2" ry="2" stroke="#333333" stroke-width="2" '
+    'width="50" x="5" y="20" />'
+    '<line stroke="#333333" stroke-width="1" x1="15" x2="15" y1="20" y2="40" />'
+    '<line stroke="#333333" stroke-width="1" x1="25" x2="25" y1="20" y2="40" />'
+    '<line stroke="#333333" stroke-width="1" x1="35" x2="35" y1="20" y2="40" />'
+    '<line stroke="#333333" stroke-width="1" x1="45" x2="45" y1="20" y2="40" />'
+    '<line stroke="#333333" stroke-width="1" x1="55" x2="55" y1="20" y2="40" />'
+    '</symbol>'
+    '<symbol id="firewall" viewBox="0 0 60 60">'
+    '<rect fill="#FFCDD2" height="40" stroke="#333333" stroke-width="2" width="40" x="10" y="10" />'
+    '<path d="M10,10 L50,50 M10,50 L50,10" fill="none" stroke="#333333" stroke-width="2" />'
+    '</symbol>'
+    '<symbol id="server" viewBox="0 0 60 60">'
+    '<rect fill="#BBDEFB" height="50" stroke="#333333" stroke-width="2" width="30" x="15" y="5" />'
+    '<line stroke="#333333" stroke-width="1" x1="15" x2="45" y1="15" y2="15" />'
+    '<line stroke="#333333" stroke-width="1" x1="15" x2="45" y1="30" y2="30" />'
+    '<line stroke="#333333" stroke-width="1" x1="15" x2="45" y1="45" y2="45" />'
+    '</symbol>'
+    '<symbol id="workstation" viewBox="0 0 60 60">'
+    '<rect fill="#D1C4E9" height="20" stroke="#333333" stroke-width="2" width="50" x="5" y="30" />'
+    '<rect fill="#D1C4E9" height="25" stroke="#333333" stroke-width="2" width="30" x="15" y="5" />'
+    '</symbol>'
+    '<symbol id="cloud" viewBox="0 0 60 60">'
+    '<ellipse cx="30" cy="30" fill="#E1F5FE" rx="25" ry="15" stroke="#333333" stroke-width="2" />'
+    '</symbol>'
+    '</defs>'
+)
+
+
+def _format_number(value: float) -> str:
+    """
+    Format a coordinate for SVG output with at most two decimals.
+    
+    Layout positions are often fractions such as 512.3333333333, so
+    trailing zeros and a bare decimal point are dropped (110.0 becomes "110").
+    
+    Args:
+        value: The number to format
+        
+    Returns:
+        The formatted number
+    """
+    text = f"{value:.2f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+@lru_cache(maxsize=None)
+def _raster_font(size: int, bold: bool = False) -> Any:
+    """
+    Load a font for raster output, shared by all raster renders.
+    
+    Args:
+        size: The font size in pixels
+        bold: Whether to use a bold face
+        
+    Returns:
+        A Pillow font; Pillow's default font if no TrueType font is found
+    """
+    from PIL import ImageFont
+    
+    names = ("DejaVuSans-Bold.ttf", "arialbd.ttf") if bold else ("DejaVuSans.ttf", "arial.ttf")
+    for name in names:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        # Pillow before 10.1 only has a fixed-size default font
+        return ImageFont.load_default()
+
 
 @dataclass
 class NetworkDiagramRenderer(SVGRenderer):
@@ -46,6 +144,10 @@ class NetworkDiagramRenderer(SVGRenderer):
     line_stroke_width: int = 2
     arrow_size: int = 8
     
+    # Write the SVG markup as text instead of building svgwrite elements;
+    # the svgwrite path is kept as a fallback
+    use_text_mode: bool = True
+    
     # Colors
     device_fill: Dict[DeviceType, str] = field(default_factory=lambda: {
         DeviceType.ROUTER: "#FFECB3",
@@ -72,6 +174,12 @@ class NetworkDiagramRenderer(SVGRenderer):
     zone_stroke: str = "#9E9E9E"
     text_color: str = "#212121"
     
+    # Text-mode markup of each device from earlier renders, keyed by
+    # device ID, with the device content and styling it was built from
+    _fragment_cache: Dict[str, Tuple[Tuple[Any, ...], str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    
     def render(self, 
                diagram: NetworkDiagram, 
                output_path: str, 
@@ -79,6 +187,9 @@ class NetworkDiagramRenderer(SVGRenderer):
         """
         Render a Network Diagram to an SVG file.
         
+        In text mode each layer collects SVG markup fragments rather than
+        svgwrite objects, and the document is joined once when saving.
+        
         Args:
             diagram: The NetworkDiagram object to render
             output_path: The file path to save the rendered diagram
@@ -90,20 +201,24 @@ class NetworkDiagramRenderer(SVGRenderer):
         # Create output directory if it doesn't exist
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        # Create SVG Drawing
-        self.drawing = Drawing(
-            output_path,
-            size=(f"{self.width}{self.unit}", f"{self.height}{self.unit}")
-        )
-        
-        # Add definitions
-        self._add_defs()
-        
-        # Create groups for different element types for layering
-        zone_group = self.drawing.add(Group(id="zones"))
-        device_group = self.drawing.add(Group(id="devices"))
-        connection_group = self.drawing.add(Group(id="connections"))
-        label_group = self.drawing.add(Group(id="labels"))
+        # Create groups for different element types for layering; text
+        # mode writes the definitions from _DEFS_MARKUP when saving
+        if self.use_text_mode:
+            zone_group, device_group, connection_group, label_group = [], [], [], []
+        else:
+            # Create SVG Drawing
+            self.drawing = Drawing(
+                output_path,
+                size=(f"{self.width}{self.unit}", f"{self.height}{self.unit}")
+            )
+            
+            # Add definitions
+            self._add_defs()
+            
+            zone_group = self.drawing.add(Group(id="zones"))
+            device_group = self.drawing.add(Group(id="devices"))
+            connection_group = self.drawing.add(Group(id="connections"))
+            label_group = self.drawing.add(Group(id="labels"))
         
         # Calculate positions for devices
         positions = self._calculate_positions(diagram)
@@ -117,8 +232,9 @@ class NetworkDiagramRenderer(SVGRenderer):
             if zone.id in zone_bounds:
                 self._render_zone(zone_group, zone, zone_bounds[zone.id])
         
-        # Draw connections between devices
-        connection_labels = {}
+        # Draw connections between devices together with their labels
+        # (skipping connections without label text). Labels go to their
+        # own layer, so they still end up above the devices
         for connection in diagram.connections:
             source_pos = positions.get(connection.source_id)
             target_pos = positions.get(connection.target_id)
@@ -130,26 +246,162 @@ class NetworkDiagramRenderer(SVGRenderer):
                     source_pos,
                     target_pos
                 )
-                connection_labels[connection.id] = midpoint
+                if connection.bandwidth or connection.protocol:
+                    self._render_connection_label(
+                        label_group,
+                        connection,
+                        midpoint
+                    )
         
         # Draw devices
         for device in diagram.devices:
             pos = positions.get(device.id, (50, 50))
             self._render_device(device_group, device, pos)
         
-        # Draw connection labels
+        # Save the SVG, encoding the whole document once and writing it
+        # in a single call
+        if self.use_text_mode:
+            svg_parts = [
+                '<?xml version="1.0" encoding="utf-8" ?>\n'
+                f'<svg baseProfile="full" height="{self.height}{self.unit}" version="1.1" '
+                f'width="{self.width}{self.unit}" xmlns="http://www.w3.org/2000/svg" '
+                'xmlns:ev="http://www.w3.org/2001/xml-events" '
+                'xmlns:xlink="http://www.w3.org/1999/xlink">',
+                _DEFS_MARKUP
+            ]
+            for layer_id, fragments in (("zones", zone_group),
+                                        ("devices", device_group),
+                                        ("connections", connection_group),
+                                        ("labels", label_group)):
+                if fragments:
+                    svg_parts.append(f'<g id="{layer_id}">{"".join(fragments)}</g>')
+                else:
+                    svg_parts.append(f'<g id="{layer_id}" />')
+            svg_parts.append('</svg>')
+            svg_content = "".join(svg_parts)
+        else:
+            buffer = io.StringIO()
+            self.drawing.write(buffer, pretty=False)
+            svg_content = buffer.getvalue()
+        with open(output_path, "wb") as f:
+            f.write(svg_content.encode("utf-8"))
+        return output_path
+    
+    def render_raster(self,
+                      diagram: NetworkDiagram,
+                      output_path: str,
+                      **kwargs) -> str:
+        """
+        Render a Network Diagram directly to a PNG image.
+        
+        Shapes are drawn with Pillow instead of going through SVG, so very
+        large topologies stay cheap to render and to view. The layout and
+        colors match render(); lines are drawn solid, since Pillow has no
+        dash patterns.
+        
+        Args:
+            diagram: The NetworkDiagram object to render
+            output_path: The file path to save the rendered image
+            **kwargs: Additional rendering options
+            
+        Returns:
+            The path to the rendered PNG file
+        """
+        from PIL import Image, ImageColor, ImageDraw
+        
+        # Create output directory if it doesn't exist
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        # RGBA drawing blends the translucent zone and label fills
+        image = Image.new("RGB", (self.width, self.height), "white")
+        draw = ImageDraw.Draw(image, "RGBA")
+        
+        positions = self._calculate_positions(diagram)
+        zone_devices = self._map_zones_to_devices(diagram)
+        
+        # Draw zones first (they'll be in the background)
+        zone_bounds = self._calculate_zone_bounds(diagram, positions, zone_devices)
+        zone_fill = ImageColor.getrgb(self.zone_fill)[:3] + (77,)
+        for zone in diagram.zones:
+            if zone.id not in zone_bounds:
+                continue
+            x, y, width, height = zone_bounds[zone.id]
+            draw.rounded_rectangle((x, y, x + width, y + height), radius=15,
+                                   fill=zone_fill, outline=self.zone_stroke, width=2)
+            draw.text((x + 20, y + 25), zone.name, fill=self.text_color,
+                      font=_raster_font(14, bold=True), anchor="ls")
+            if zone.zone_type:
+                draw.text((x + 20, y + 45), f"({zone.zone_type})", fill=self.text_color,
+                          font=_raster_font(12), anchor="ls")
+            if zone.cidr:
+                draw.text((x + 20, y + 65), zone.cidr, fill=self.text_color,
+                          font=_raster_font(12), anchor="ls")
+        
+        # Draw connections between devices, keeping the labeled ones to
+        # draw their labels above the devices
+        labeled_connections = []
         for connection in diagram.connections:
-            if connection.id in connection_labels:
-                self._render_connection_label(
-                    label_group,
-                    connection,
-                    connection_labels[connection.id]
-                )
+            source_pos = positions.get(connection.source_id)
+            target_pos = positions.get(connection.target_id)
+            
+            if source_pos and target_pos:
+                draw.line((source_pos, target_pos),
+                          fill=self.connection_color.get(connection.connection_type, "#000000"),
+                          width=self.line_stroke_width)
+                if connection.bandwidth or connection.protocol:
+                    labeled_connections.append((connection,
+                                                (source_pos[0] + target_pos[0]) / 2,
+                                                (source_pos[1] + target_pos[1]) / 2))
+        
+        # Draw devices
+        for device in diagram.devices:
+            cx, cy = positions.get(device.id, (50, 50))
+            x = cx - self.device_width // 2
+            y = cy - self.device_height // 2
+            cx = x + self.device_width // 2
+            draw.rounded_rectangle((x, y, x + self.device_width, y + self.device_height),
+                                   radius=5,
+                                   fill=self.device_fill.get(device.device_type, "#CFD8DC"),
+                                   outline=self.device_stroke, width=2)
+            draw.text((cx, y + self.device_height // 2), device.device_type.name,
+                      fill=self.text_color, font=_raster_font(12, bold=True), anchor="ms")
+            draw.text((cx, y + self.device_height + 15), device.name,
+                      fill=self.text_color, font=_raster_font(12, bold=True), anchor="ms")
+            if device.ip_address:
+                draw.text((cx, y + self.device_height + 30), device.ip_address,
+                          fill=self.text_color, font=_raster_font(10), anchor="ms")
         
-        # Save the SVG
-        self.drawing.save()
+        # Draw connection labels
+        for connection, x, y in labeled_connections:
+            draw.rounded_rectangle((x - 40, y - 10, x + 40, y + 10), radius=5,
+                                   fill=(255, 255, 255, 178))
+            if connection.bandwidth:
+                draw.text((x, y), connection.bandwidth, fill=self.text_color,
+                          font=_raster_font(10), anchor="ms")
+            if connection.protocol:
+                draw.text((x, y - 15 if connection.bandwidth else y), connection.protocol,
+                          fill=self.text_color, font=_raster_font(10), anchor="ms")
+        
+        image.save(output_path, "PNG")
         return output_path
     
+    def invalidate(self, device_id: Optional[str] = None) -> None:
+        """
+        Drop cached device markup so it is rebuilt on the next render.
+        
+        Cached markup is already rebuilt when a device's name, type, IP
+        address, position or styling change; this is for other edits.
+        
+        Args:
+            device_id: The device to drop, or None to drop every device
+        """
+        if device_id is None:
+            self._fragment_cache.clear()
+        else:
+            self._fragment_cache.pop(device_id, None)
+    
     def _add_defs(self) -> None:
         """Add definitions to the SVG (markers, patterns, etc.)."""
         # Add arrow marker for directed connections
@@ -318,9 +570,11 @@ class NetworkDiagramRenderer(SVGRenderer):
         """
         zone_devices = {zone.id: [] for zone in diagram.zones}
         
+        # One lookup per device; devices without a known zone get None
         for device in diagram.devices:
-            if device.zone_id and device.zone_id in zone_devices:
-                zone_devices[device.zone_id].append(device.id)
+            device_ids = zone_devices.get(device.zone_id)
+            if device_ids is not None:
+                device_ids.append(device.id)
         
         return zone_devices
     
@@ -353,11 +607,13 @@ class NetworkDiagramRenderer(SVGRenderer):
             if not device_positions:
                 continue
                 
-            # Calculate min/max coordinates
-            min_x = min(pos[0] for pos in device_positions) - self.device_width // 2
-            min_y = min(pos[1] for pos in device_positions) - self.device_height // 2
-            max_x = max(pos[0] for pos in device_positions) + self.device_width // 2
-            max_y = max(pos[1] for pos in device_positions) + self.device_height // 2
+            # Calculate min/max coordinates over the x and y columns, so
+            # min() and max() scan plain tuples instead of generators
+            xs, ys = zip(*device_positions)
+            min_x = min(xs) - self.device_width // 2
+            min_y = min(ys) - self.device_height // 2
+            max_x = max(xs) + self.device_width // 2
+            max_y = max(ys) + self.device_height // 2
             
             # Add padding
             min_x -= self.zone_padding
@@ -387,22 +643,6 @@ class NetworkDiagramRenderer(SVGRenderer):
         """
         x, y = position
         
-        # Create device group
-        device_group = group.add(Group(id=f"device-{device.id}"))
-        
-        # Determine icon type
-        icon_id = "server"  # Default icon
-        if device.device_type == DeviceType.ROUTER:
-            icon_id = "router"
-        elif device.device_type == DeviceType.SWITCH:
-            icon_id = "switch"
-        elif device.device_type == DeviceType.FIREWALL:
-            icon_id = "firewall"
-        elif device.device_type == DeviceType.WORKSTATION:
-            icon_id = "workstation"
-        elif device.device_type == DeviceType.CLOUD:
-            icon_id = "cloud"
-        
         # Adjust position to center the device
         x -= self.device_width // 2
         y -= self.device_height // 2
@@ -410,6 +650,43 @@ class NetworkDiagramRenderer(SVGRenderer):
         # Add device shape or icon
         fill_color = self.device_fill.get(device.device_type, "#CFD8DC")
         
+        if self.use_text_mode:
+            # Re-renders of an unchanged device reuse its markup
+            cache_key = (
+                device.name, device.device_type, device.ip_address, position,
+                self.device_width, self.device_height, fill_color,
+                self.device_stroke, self.text_color
+            )
+            cached = self._fragment_cache.get(device.id)
+            if cached is not None and cached[0] == cache_key:
+                group.append(cached[1])
+                return
+            
+            cx = _format_number(x + self.device_width // 2)
+            # The device type, name and IP address share one text node: the
+            # type is centered in the box, and the name and IP address
+            # are spans below it
+            ip_span = (f'<tspan dy="15" font-size="10px" font-weight="normal" x="{cx}">'
+                       f'{escape(device.ip_address)}</tspan>' if device.ip_address else "")
+            markup = (
+                f'<g id={quoteattr(f"device-{device.id}")}>'
+                f'<rect fill={quoteattr(fill_color)} height="{self.device_height}" rx="5" ry="5" '
+                f'stroke={quoteattr(self.device_stroke)} stroke-width="2" '
+                f'width="{self.device_width}" x="{_format_number(x)}" y="{_format_number(y)}" />'
+                f'<text fill={quoteattr(self.text_color)} font-family="Arial, sans-serif" '
+                f'font-size="12px" font-weight="bold" text-anchor="middle" x="{cx}" '
+                f'y="{_format_number(y + self.device_height // 2)}">'
+                f'{escape(device.device_type.name)}'
+                f'<tspan x="{cx}" y="{_format_number(y + self.device_height + 15)}">'
+                f'{escape(device.name)}</tspan>{ip_span}</text></g>'
+            )
+            self._fragment_cache[device.id] = (cache_key, markup)
+            group.append(markup)
+            return
+        
+        # Create device group
+        device_group = group.add(Group(id=f"device-{device.id}"))
+        
         # Draw the device as a rectangle with icon symbol
         rect = Rect(
             insert=(x, y),
@@ -421,40 +698,28 @@ class NetworkDiagramRenderer(SVGRenderer):
         )
         device_group.add(rect)
         
-        # Add device name
-        name_text = Text(
-            device.name,
-            insert=(x + self.device_width // 2, y + self.device_height + 15),
+        # Add device type label, with the device name below the box
+        cx = x + self.device_width // 2
+        type_text = Text(
+            device.device_type.name,
+            insert=(cx, y + self.device_height // 2),
             fill=self.text_color,
             font_family="Arial, sans-serif",
             font_size="12px",
             text_anchor="middle",
             font_weight="bold"
         )
-        device_group.add(name_text)
+        type_text.add(TSpan(device.name, insert=(cx, y + self.device_height + 15)))
         
         # Add IP address if present
         if device.ip_address:
-            ip_text = Text(
+            type_text.add(TSpan(
                 device.ip_address,
-                insert=(x + self.device_width // 2, y + self.device_height + 30),
-                fill=self.text_color,
-                font_family="Arial, sans-serif",
+                x=[cx],
+                dy=[15],
                 font_size="10px",
-                text_anchor="middle"
-            )
-            device_group.add(ip_text)
-        
-        # Add device type label
-        type_text = Text(
-            device.device_type.name,
-            insert=(x + self.device_width // 2, y + self.device_height // 2),
-            fill=self.text_color,
-            font_family="Arial, sans-serif",
-            font_size="12px",
-            text_anchor="middle",
-            font_weight="bold"
-        )
+                font_weight="normal"
+            ))
         device_group.add(type_text)
     
     def _render_connection(self,
@@ -484,25 +749,39 @@ class NetworkDiagramRenderer(SVGRenderer):
         # Determine line style based on connection type
         stroke_color = self.connection_color.get(connection.connection_type, "#000000")
         
-        # Create the connection line
-        line = Line(
-            start=(x1, y1),
-            end=(x2, y2),
-            stroke=stroke_color,
-            stroke_width=self.line_stroke_width
-        )
+        if self.use_text_mode:
+            marker_attr = "" if connection.is_bidirectional else 'marker-end="url(#arrow)" '
+            dash_array = _DASH_BY_CONNECTION.get(connection.connection_type)
+            dash_attr = f'stroke-dasharray="{dash_array}" ' if dash_array else ""
+            group.append(
+                f'<line {marker_attr}stroke={quoteattr(stroke_color)} {dash_attr}'
+                f'stroke-width="{self.line_stroke_width}" '
+                f'x1="{_format_number(x1)}" x2="{_format_number(x2)}" '
+                f'y1="{_format_number(y1)}" y2="{_format_number(y2)}" />'
+            )
+            return (mid_x, mid_y)
+        
+        # Collect the optional attributes first, so the line is built in one
+        # call instead of being updated through svgwrite's item setter
+        extra = {}
         
         # Add arrowhead for unidirectional connections
         if not connection.is_bidirectional:
-            line["marker-end"] = "url(#arrow)"
+            extra["marker_end"] = "url(#arrow)"
         
         # Add dashing for certain connection types
-        if connection.connection_type == ConnectionType.WIRELESS:
-            line["stroke-dasharray"] = "5,3"
-        elif connection.connection_type == ConnectionType.VPN:
-            line["stroke-dasharray"] = "10,5"
+        dash_array = _DASH_BY_CONNECTION.get(connection.connection_type)
+        if dash_array:
+            extra["stroke_dasharray"] = dash_array
         
-        group.add(line)
+        # Create the connection line
+        group.add(Line(
+            start=(x1, y1),
+            end=(x2, y2),
+            stroke=stroke_color,
+            stroke_width=self.line_stroke_width,
+            **extra
+        ))
         
         return (mid_x, mid_y)
     
@@ -513,24 +792,45 @@ class NetworkDiagramRenderer(SVGRenderer):
         """
         Render a label for a connection.
         
+        Connections without a bandwidth or protocol get no label elements.
+        
         Args:
             group: The SVG group to add the label to
             connection: The NetworkConnection object
             position: The (x, y) position for the label
         """
+        if not (connection.bandwidth or connection.protocol):
+            return
+        
         x, y = position
         
-        # Create background for the label
-        if connection.bandwidth or connection.protocol:
-            label_bg = Rect(
-                insert=(x - 40, y - 10),
-                size=(80, 20),
-                rx=5, ry=5,
-                fill="white",
-                fill_opacity=0.7,
-                stroke="none"
+        if self.use_text_mode:
+            # Backing that keeps the label readable over the connection line
+            group.append(
+                f'<rect fill="white" fill-opacity="0.7" height="20" rx="5" ry="5" '
+                f'stroke="none" width="80" x="{_format_number(x - 40)}" '
+                f'y="{_format_number(y - 10)}" />'
             )
-            group.add(label_bg)
+            if connection.bandwidth:
+                group.append(self._text_markup(connection.bandwidth, (x, y), "10px",
+                                               text_anchor="middle"))
+            if connection.protocol:
+                group.append(self._text_markup(connection.protocol,
+                                               (x, y - 15 if connection.bandwidth else y),
+                                               "10px", font_style="italic",
+                                               text_anchor="middle"))
+            return
+        
+        # Create background for the label
+        label_bg = Rect(
+            insert=(x - 40, y - 10),
+            size=(80, 20),
+            rx=5, ry=5,
+            fill="white",
+            fill_opacity=0.7,
+            stroke="none"
+        )
+        group.add(label_bg)
         
         # Add bandwidth label if present
         if connection.bandwidth:
@@ -571,6 +871,23 @@ class NetworkDiagramRenderer(SVGRenderer):
         """
         x, y, width, height = bounds
         
+        if self.use_text_mode:
+            group.append(
+                f'<rect fill={quoteattr(self.zone_fill)} fill-opacity="0.3" '
+                f'height="{_format_number(height)}" '
+                f'rx="15" ry="15" stroke={quoteattr(self.zone_stroke)} stroke-dasharray="5,5" '
+                f'stroke-width="2" width="{_format_number(width)}" '
+                f'x="{_format_number(x)}" y="{_format_number(y)}" />'
+            )
+            group.append(self._text_markup(zone.name, (x + 20, y + 25), "14px",
+                                           font_weight="bold"))
+            if zone.zone_type:
+                group.append(self._text_markup(f"({zone.zone_type})", (x + 20, y + 45),
+                                               "12px", font_style="italic"))
+            if zone.cidr:
+                group.append(self._text_markup(zone.cidr, (x + 20, y + 65), "12px"))
+            return
+        
         # Create zone rectangle
         rect = Rect(
             insert=(x, y),
@@ -616,4 +933,36 @@ class NetworkDiagramRenderer(SVGRenderer):
                 font_family="Arial, sans-serif",
                 font_size="12px"
             )
-            group.add(cidr_text) 
\ No newline at end of file
+            group.add(cidr_text) 
+    
+    def _text_markup(self,
+                     text: str,
+                     insert: Tuple[float, float],
+                     font_size: str,
+                     font_style: Optional[str] = None,
+                     font_weight: Optional[str] = None,
+                     text_anchor: Optional[str] = None) -> str:
+        """
+        Build the markup of a text node in the diagram font and text color.
+        
+        Args:
+            text: The text content
+            insert: The (x, y) position of the text anchor
+            font_size: The font size
+            font_style: Optional font style
+            font_weight: Optional font weight
+            text_anchor: Optional text anchor
+            
+        Returns:
+            The SVG markup of the text node
+        """
+        attributes = f'fill={quoteattr(self.text_color)} font-family="Arial, sans-serif" '
+        attributes += f'font-size="{font_size}" '
+        if font_style:
+            attributes += f'font-style="{font_style}" '
+        if font_weight:
+            attributes += f'font-weight="{font_weight}" '
+        if text_anchor:
+            attributes += f'text-anchor="{text_anchor}" '
+        return (f'<text {attributes}x="{_format_number(insert[0])}" '
+                f'y="{_format_number(insert[1])}">{escape(text)}</text>')
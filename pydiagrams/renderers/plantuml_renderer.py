@@ -3,11 +3,13 @@ PlantUML renderer for PyDiagrams.
 """
 
 import os
-import base64
-import zlib
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+
+from pydiagrams.parsers.plantuml_encoding import encode_plantuml
 
 
 class PlantUMLRenderer:
@@ -16,10 +18,29 @@ class PlantUMLRenderer:
     # Default PlantUML server URL
     PLANTUML_SERVER = "http://www.plantuml.com/plantuml"
     
+    # Seconds to wait for the PlantUML server before using the fallback output
+    REQUEST_TIMEOUT = 10
+    
     def __init__(self):
         """Initialize the PlantUML renderer."""
-        pass
+        # requests.Session is not documented as thread-safe, so each thread
+        # keeps its own session; repeated renders from a thread still reuse
+        # its keep-alive connection to the server instead of reconnecting
+        self._local = threading.local()
+    
+    @property
+    def _session(self) -> requests.Session:
+        """
+        Get the calling thread's session, creating it on first use.
         
+        Returns:
+            The HTTP session for requests from this thread
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+    
     def render(self, diagram_data: Dict[str, Any], output_path: str) -> str:
         """
         Render PlantUML diagram data to an SVG file.
@@ -33,11 +54,12 @@ class PlantUMLRenderer:
         """
         # For PlantUML, we'll use the PlantUML server to generate an SVG
         content = diagram_data.get('raw_content', '')
-        encoded_content = self._encode_plantuml(content)
+        encoded_content = encode_plantuml(content)
         
         try:
             # Get SVG from PlantUML server
-            response = requests.get(f"{self.PLANTUML_SERVER}/svg/{encoded_content}")
+            response = self._session.get(f"{self.PLANTUML_SERVER}/svg/{encoded_content}",
+                                         timeout=self.REQUEST_TIMEOUT)
             response.raise_for_status()
             
             # Write the SVG to the output file
@@ -76,11 +98,12 @@ class PlantUMLRenderer:
         """
         # For PlantUML, we'll use the PlantUML server to generate a PNG
         content = diagram_data.get('raw_content', '')
-        encoded_content = self._encode_plantuml(content)
+        encoded_content = encode_plantuml(content)
         
         try:
             # Get PNG from PlantUML server
-            response = requests.get(f"{self.PLANTUML_SERVER}/png/{encoded_content}")
+            response = self._session.get(f"{self.PLANTUML_SERVER}/png/{encoded_content}",
+                                         timeout=self.REQUEST_TIMEOUT)
             response.raise_for_status()
             
             # Write the PNG to the output file
@@ -96,23 +119,30 @@ class PlantUMLRenderer:
                 f.write(b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\x0bIDAT\x08\xd7c\xf8\xff\xff?\x00\x05\xfe\x02\xfe\xdc\xcc\x59\xe7\x00\x00\x00\x00IEND\xaeB`\x82')
                 
             return output_path
-            
-    def _encode_plantuml(self, text: str) -> str:
+    
+    def render_many(self,
+                    diagrams: List[Tuple[Dict[str, Any], str]],
+                    output_format: str = 'svg',
+                    max_workers: int = 8) -> List[str]:
         """
-        Encode PlantUML text for use with the PlantUML server.
-
+        Render several PlantUML diagrams to SVG or PNG.
+        
+        The server requests are sent from a thread pool, so their round
+        trips overlap instead of running one after the other. Each worker
+        thread uses its own session.
+        
         Args:
-            text: PlantUML text
-
+            diagrams: (diagram_data, output_path) pairs to render
+            output_format: Output format ('svg' or 'png')
+            max_workers: Maximum number of concurrent requests
+            
         Returns:
-            Encoded string for URL
+            List[str]: Paths to the rendered diagrams, in input order
         """
-        # Convert to UTF-8 and compress with zlib
-        zlibbed = zlib.compress(text.encode('utf-8'))
-        
-        # Convert to base64 and replace unsafe characters
-        compressed = base64.b64encode(zlibbed).decode('ascii')
-        compressed = compressed.replace('+', '-').replace('/', '_')
+        render = self.render_png if output_format == 'png' else self.render
+        if max_workers <= 1 or len(diagrams) < 2:
+            return [render(diagram_data, output_path) for diagram_data, output_path in diagrams]
         
-        # Add ~1 prefix to indicate DEFLATE encoding
-        return f"~1{compressed}" 
\ No newline at end of file
+        # map() keeps the input order
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(diagrams))) as executor:
+            return list(executor.map(lambda item: render(*item), diagrams))
@@ -12,6 +12,10 @@ from svgwrite.container import Group
 
 from pydiagrams.renderers.svg_renderer import SVGRenderer
 
+# Approximate glyph width and horizontal padding of transition label backgrounds
+_LABEL_CHAR_PX = 6
+_LABEL_PAD_PX = 6
+
 
 class StateDiagramRenderer(SVGRenderer):
     """Specialized renderer for UML State Diagrams."""
@@ -56,6 +60,11 @@ class StateDiagramRenderer(SVGRenderer):
         self.text_color = "#000000"
         self.region_stroke = "#999999"
         self.region_fill = "#FAFAFA"
+        
+        # Stylesheet and marker elements, built on first render and shared by
+        # every drawing afterwards since they never change
+        self._state_style = None
+        self._arrowhead_marker = None
     
     def render(self, diagram_data: Dict[str, Any], output_path: str) -> str:
         """
@@ -100,10 +109,11 @@ class StateDiagramRenderer(SVGRenderer):
                 if state_group:
                     main_group.add(state_group)
         
-        # Render all transitions
+        # Render all transitions, looking their states up in one shared map
+        states = {s.get("id"): s for s in diagram_data.get("elements", []) if s.get("type") == "state"}
         for transition in diagram_data.get("relationships", []):
             if transition.get("type") == "transition":
-                transition_group = self._render_transition(dwg, transition, diagram_data)
+                transition_group = self._render_transition(dwg, transition, diagram_data, states)
                 if transition_group:
                     main_group.add(transition_group)
         
@@ -122,6 +132,10 @@ class StateDiagramRenderer(SVGRenderer):
         Args:
             dwg: The SVG drawing to add styles to.
         """
+        if self._state_style is not None:
+            dwg.defs.add(self._state_style)
+            return
+        
         style = dwg.style(content="""
             .state {
                 fill: #FFFFFF;
@@ -208,6 +222,7 @@ class StateDiagramRenderer(SVGRenderer):
                 text-anchor: start;
             }
         """)
+        self._state_style = style
         dwg.defs.add(style)
     
     def _add_state_definitions(self, dwg: svgwrite.Drawing) -> None:
@@ -217,6 +232,10 @@ class StateDiagramRenderer(SVGRenderer):
         Args:
             dwg: The SVG drawing to add definitions to.
         """
+        if self._arrowhead_marker is not None:
+            dwg.defs.add(self._arrowhead_marker)
+            return
+        
         # Define arrowhead marker for transitions
         marker = dwg.marker(
             id="arrowhead",
@@ -225,6 +244,7 @@ class StateDiagramRenderer(SVGRenderer):
             orient="auto"
         )
         marker.add(dwg.path(d="M0,0 L0,10 L10,5 z", class_="transition-arrow"))
+        self._arrowhead_marker = marker
         dwg.defs.add(marker)
     
     def _preprocess_state_diagram(self, diagram_data: Dict[str, Any]) -> None:
@@ -608,7 +628,8 @@ class StateDiagramRenderer(SVGRenderer):
         return state_group
     
     def _render_transition(self, dwg: svgwrite.Drawing, transition_data: Dict[str, Any],
-                          diagram_data: Dict[str, Any]) -> Optional[Group]:
+                          diagram_data: Dict[str, Any],
+                          states: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[Group]:
         """
         Render a transition as an SVG group.
         
@@ -616,6 +637,7 @@ class StateDiagramRenderer(SVGRenderer):
             dwg: The SVG drawing.
             transition_data: The transition data as a dictionary.
             diagram_data: The complete diagram data.
+            states: The diagram's states by ID, built from diagram_data if not given.
             
         Returns:
             An SVG group representing the transition, or None if the transition can't be rendered.
@@ -632,7 +654,8 @@ class StateDiagramRenderer(SVGRenderer):
         transition_group = dwg.g(id=f"transition-{source_id}-{target_id}")
         
         # Get source and target state data
-        states = {s.get("id"): s for s in diagram_data.get("elements", []) if s.get("type") == "state"}
+        if states is None:
+            states = {s.get("id"): s for s in diagram_data.get("elements", []) if s.get("type") == "state"}
         source_state = states.get(source_id)
         target_state = states.get(target_id)
         
@@ -669,21 +692,30 @@ class StateDiagramRenderer(SVGRenderer):
             mid_x = (start_point[0] + end_point[0]) / 2
             mid_y = (start_point[1] + end_point[1]) / 2
             
-            # Add a slight offset perpendicular to the line
-            angle = math.atan2(end_point[1] - start_point[1], end_point[0] - start_point[0])
-            offset_x = -10 * math.sin(angle)
-            offset_y = 10 * math.cos(angle)
+            # Add a slight offset perpendicular to the line, scaling the
+            # direction vector instead of going through its angle
+            dx = end_point[0] - start_point[0]
+            dy = end_point[1] - start_point[1]
+            length = math.hypot(dx, dy)
+            if length > 0:
+                scale = 10 / length
+                offset_x = -dy * scale
+                offset_y = dx * scale
+            else:
+                offset_x, offset_y = 0, 10
+            label_x = mid_x + offset_x
+            label_y = mid_y + offset_y
             
             text = dwg.text(
                 label,
-                insert=(mid_x + offset_x, mid_y + offset_y),
+                insert=(label_x, label_y),
                 class_="transition-label"
             )
             
             # Add a small white background for better readability
             text_bg = dwg.rect(
-                insert=(mid_x + offset_x - 3, mid_y + offset_y - 12),
-                size=(len(label) * 6 + 6, 16),
+                insert=(label_x - 3, label_y - 12),
+                size=(len(label) * _LABEL_CHAR_PX + _LABEL_PAD_PX, 16),
                 fill="white",
                 stroke="none"
             )
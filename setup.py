@@ -1,8 +1,20 @@
+import os
+
 from setuptools import setup, find_packages
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
 
+# Optionally compile the interpreter-bound ERD label building with Cython.
+# The .py sources are still installed, so builds without Cython keep working.
+ext_modules = []
+if os.environ.get("PYDIAGRAMS_ENABLE_SPEEDUPS") == "1":
+    from Cython.Build import cythonize
+    ext_modules = cythonize(
+        ["pydiagrams/renderers/erd_renderer.py"],
+        compiler_directives={"language_level": "3"},
+    )
+
 setup(
     name="pydiagrams",
     version="0.1.0",
@@ -13,6 +25,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/pydiagrams/pydiagrams",
     packages=find_packages(),
+    ext_modules=ext_modules,
     classifiers=[
         "Programming Language :: Python :: 3",
         "Programming Language :: Python :: 3.7",
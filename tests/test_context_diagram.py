@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for System Context Diagram rendering.
+
+This module contains unit tests for the System Context Diagram renderer.
+"""
+
+import unittest
+import os
+import tempfile
+from unittest import mock
+
+from svgwrite.shapes import Rect
+
+from pydiagrams.diagrams.architectural.context_diagram import (
+    SystemContextDiagram, ElementType, RelationshipType
+)
+from pydiagrams.renderers.context_renderer import SystemContextDiagramRenderer
+
+
+class TestSystemContextDiagramRenderer(unittest.TestCase):
+    """Test case for the System Context Diagram renderer."""
+    
+    def setUp(self):
+        """Set up test cases."""
+        self.diagram = SystemContextDiagram(
+            name="Test Context Diagram",
+            description="Test description"
+        )
+        self.renderer = SystemContextDiagramRenderer()
+    
+    def test_boundary_bounds_skip_unpositioned_elements(self):
+        """Test that an element without a position does not shift boundary bounds."""
+        person = self.diagram.create_element("Customer", element_type=ElementType.PERSON)
+        system = self.diagram.create_element("Banking System")
+        boundary = self.diagram.create_boundary("Bank", element_ids=[person.id, system.id])
+        
+        # Only the system has a position
+        positions = {system.id: (500, 400)}
+        bounds = self.renderer._calculate_boundary_bounds(
+            self.diagram, positions, {boundary.id: boundary.element_ids}
+        )
+        
+        padding = self.renderer.boundary_padding
+        self.assertEqual(
+            bounds[boundary.id],
+            (500 - self.renderer.element_width // 2 - padding,
+             400 - self.renderer.element_height // 2 - padding,
+             self.renderer.element_width + 2 * padding,
+             self.renderer.element_height + 2 * padding)
+        )
+    
+    def test_boundary_bounds_skip_empty_boundaries(self):
+        """Test that boundaries without positioned elements get no bounds."""
+        boundary = self.diagram.create_boundary("Empty", element_ids=["missing"])
+        bounds = self.renderer._calculate_boundary_bounds(
+            self.diagram, {}, {boundary.id: boundary.element_ids}
+        )
+        
+        self.assertNotIn(boundary.id, bounds)
+    
+    def test_render_diagram(self):
+        """Test rendering a system context diagram."""
+        person = self.diagram.create_element("Customer", element_type=ElementType.PERSON)
+        system = self.diagram.create_element("Banking System", "Handles accounts")
+        database = self.diagram.create_element("Accounts", element_type=ElementType.DATABASE)
+        self.diagram.create_relationship(person.id, system.id, "Uses", technology="HTTPS")
+        self.diagram.create_relationship(
+            system.id, database.id, "Reads from",
+            relationship_type=RelationshipType.DEPENDS_ON
+        )
+        self.diagram.create_boundary("Bank", element_ids=[system.id, database.id])
+        
+        # Create a temporary file for the rendered diagram
+        with tempfile.NamedTemporaryFile(suffix=".svg", delete=False) as tmp:
+            tmp_path = tmp.name
+        
+        try:
+            output_path = self.renderer.render(self.diagram, tmp_path)
+            
+            # Check if the file exists and has content
+            self.assertTrue(os.path.exists(output_path))
+            with open(output_path, "r") as f:
+                svg_content = f.read()
+            self.assertIn("<svg", svg_content)
+            self.assertIn("Banking System", svg_content)
+        finally:
+            # Clean up the temporary file
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    
+    def test_render_rejects_raw_fragments_in_non_empty_layer(self):
+        """Test that raw fragments are not silently dropped from a non-empty layer."""
+        self.diagram.create_element("Banking System")
+        
+        def render_element(group, element, position):
+            # Mix an svgwrite child into the layer that gets raw fragments
+            group.add(Rect(insert=position, size=(10, 10)))
+            self.renderer._emit_raw(group["id"], "<rect />")
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with mock.patch.object(self.renderer, "_render_element", side_effect=render_element):
+                with self.assertRaises(RuntimeError):
+                    self.renderer.render(self.diagram, os.path.join(tmp_dir, "context.svg"))
+    
+    def test_render_into_relative_directory_after_chdir(self):
+        """Test that a relative output directory is created again in a new working directory."""
+        self.diagram.create_element("Banking System")
+        cwd = os.getcwd()
+        
+        with tempfile.TemporaryDirectory() as first_dir, tempfile.TemporaryDirectory() as second_dir:
+            try:
+                for work_dir in (first_dir, second_dir):
+                    os.chdir(work_dir)
+                    self.renderer.render(self.diagram, os.path.join("out", "context.svg"))
+                    self.assertTrue(os.path.exists(os.path.join(work_dir, "out", "context.svg")))
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for Deployment Diagram rendering.
+
+This module contains unit tests for the Deployment Diagram renderer.
+"""
+
+import unittest
+import os
+import tempfile
+
+from pydiagrams.diagrams.architectural.deployment_diagram import (
+    DeploymentDiagram, DeploymentNode, DeploymentArtifact, CommunicationPath
+)
+from pydiagrams.renderers.deployment_renderer import DeploymentDiagramRenderer
+
+
+class TestDeploymentDiagramRenderer(unittest.TestCase):
+    """Test case for the Deployment Diagram renderer."""
+    
+    def setUp(self):
+        """Set up test cases."""
+        self.diagram = DeploymentDiagram(
+            name="Test Deployment Diagram",
+            description="Test description"
+        )
+    
+    def test_grid_positions(self):
+        """Test that nodes are laid out on a grid by default."""
+        nodes = [DeploymentNode(name=f"Node {i}") for i in range(3)]
+        for node in nodes:
+            self.diagram.add_node(node)
+        
+        renderer = DeploymentDiagramRenderer()
+        positions = renderer._calculate_positions(self.diagram)
+        
+        self.assertEqual(positions[nodes[0].id], (50, 50))
+        self.assertEqual(positions[nodes[1].id], (300, 50))
+        self.assertEqual(positions[nodes[2].id], (50, 250))
+    
+    def test_avoid_overlaps_moves_nodes_below_artifacts(self):
+        """Test that a node is moved down when the node above overflows."""
+        nodes = [DeploymentNode(name=f"Node {i}") for i in range(3)]
+        for i in range(3):
+            nodes[0].add_artifact(DeploymentArtifact(name=f"artifact{i}.jar"))
+        for node in nodes:
+            self.diagram.add_node(node)
+        
+        renderer = DeploymentDiagramRenderer(avoid_overlaps=True)
+        positions = renderer._calculate_positions(self.diagram)
+        
+        # The first node's artifacts reach 265px below it, past the next row
+        self.assertEqual(positions[nodes[0].id], (50, 50))
+        self.assertEqual(positions[nodes[1].id], (300, 50))
+        self.assertEqual(positions[nodes[2].id], (50, 450))
+    
+    def test_render_diagram(self):
+        """Test rendering a deployment diagram."""
+        server = DeploymentNode(name="Web Server", stereotype="device")
+        server.add_artifact(DeploymentArtifact(name="app.war"))
+        database = DeploymentNode(name="Database")
+        self.diagram.add_node(server)
+        self.diagram.add_node(database)
+        self.diagram.add_communication_path(CommunicationPath(
+            name="JDBC", source_id=server.id, target_id=database.id, protocol="TCP"
+        ))
+        
+        # Create a temporary file for the rendered diagram
+        with tempfile.NamedTemporaryFile(suffix=".svg", delete=False) as tmp:
+            tmp_path = tmp.name
+        
+        try:
+            output_path = DeploymentDiagramRenderer().render(self.diagram, tmp_path)
+            
+            # Check if the file exists and has content
+            self.assertTrue(os.path.exists(output_path))
+            with open(output_path, "r", encoding="utf-8") as f:
+                svg_content = f.read()
+            self.assertIn("<svg", svg_content)
+            self.assertIn("Web Server", svg_content)
+            self.assertIn("«TCP»", svg_content)
+        finally:
+            # Clean up the temporary file
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    
+    def test_render_into_relative_directory_after_chdir(self):
+        """Test that a relative output directory is created again in a new working directory."""
+        self.diagram.add_node(DeploymentNode(name="Web Server"))
+        renderer = DeploymentDiagramRenderer()
+        cwd = os.getcwd()
+        
+        with tempfile.TemporaryDirectory() as first_dir, tempfile.TemporaryDirectory() as second_dir:
+            try:
+                for work_dir in (first_dir, second_dir):
+                    os.chdir(work_dir)
+                    renderer.render(self.diagram, os.path.join("out", "deployment.svg"))
+                    self.assertTrue(os.path.exists(os.path.join(work_dir, "out", "deployment.svg")))
+            finally:
+                os.chdir(cwd)
+    
+    def test_render_recreates_removed_output_directory(self):
+        """Test that an output directory removed after a render is created again."""
+        self.diagram.add_node(DeploymentNode(name="Web Server"))
+        renderer = DeploymentDiagramRenderer()
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_dir = os.path.join(tmp_dir, "out")
+            output_path = os.path.join(output_dir, "deployment.svg")
+            renderer.render(self.diagram, output_path)
+            
+            os.unlink(output_path)
+            os.rmdir(output_dir)
+            renderer.render(self.diagram, output_path)
+            self.assertTrue(os.path.exists(output_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
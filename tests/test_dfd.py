@@ -2,9 +2,14 @@
 Tests for the Data Flow Diagram implementation.
 """
 
+import json
 import os
 import sys
+import tempfile
 import unittest
+from unittest import mock
+
+import graphviz
 
 # Add the parent directory to the sys.path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -20,6 +25,7 @@ from pydiagrams.diagrams.entity.dfd import (
     FlowType,
     DFDElement
 )
+from pydiagrams.renderers.dfd_renderer import DFDRenderer
 
 
 class TestDataFlowDiagram(unittest.TestCase):
@@ -332,5 +338,103 @@ class TestDataFlowDiagram(unittest.TestCase):
         self.assertEqual(len(flows_to_user), 2)  # Auth Response and Response
 
 
+class TestDFDRendererLayoutCache(unittest.TestCase):
+    """Test cases for the DFDRenderer layout cache."""
+    
+    # Graphviz "plain" output for the test diagram; the data store's name
+    # needs quoting and escaping
+    PLAIN_OUTPUT = (
+        'graph 1 3.5 1.5\n'
+        'node p1 1 0.5 1.2 0.5 "1.0\\nProcess" solid box black white\n'
+        'node "store \\"a\\"" 2.5 1.25 1.2 0.5 "D1\\nStore" solid box black white\n'
+        'edge p1 "store \\"a\\"" 4 1.6 0.5 1.9 0.8 2.1 1 2.3 1.2 solid black\n'
+        'stop\n'
+    )
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.diagram = DataFlowDiagram(name="Test DFD")
+        self.diagram.add_process(Process(id="p1", name="Process", process_number="1.0"))
+        self.diagram.add_data_store(DataStore(id='store "a"', name="Store", store_number="D1"))
+        self.diagram.create_data_flow(source_id="p1", target_id='store "a"', name="Write")
+        
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.output_path = os.path.join(self.tmp_dir.name, "dfd.svg")
+        self.layout_path = self.output_path + ".layout.json"
+        self.pipe_calls = []
+    
+    def _fake_pipe(self, source, format=None, encoding=None, **kwargs):
+        """Record a Graphviz call and return canned output instead of running it."""
+        self.pipe_calls.append((format, kwargs, source.source))
+        if format == 'plain':
+            return self.PLAIN_OUTPUT
+        return b"<svg />"
+    
+    def _render(self, engine='dot'):
+        """Render the test diagram with Graphviz patched out, returning its calls."""
+        self.pipe_calls = []
+        renderer = DFDRenderer(self.diagram, engine=engine, cache_layout=True)
+        with mock.patch.object(graphviz.Source, "pipe", autospec=True, side_effect=self._fake_pipe):
+            renderer.render(self.output_path)
+        return self.pipe_calls
+    
+    def _load_layout(self):
+        """Read the layout sidecar."""
+        with open(self.layout_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    
+    def test_first_render_saves_layout(self):
+        """Test that the node positions of the plain output are saved in points."""
+        calls = self._render()
+        
+        self.assertEqual([(format, kwargs) for format, kwargs, _ in calls],
+                         [('svg', {}), ('plain', {})])
+        self.assertEqual(self._load_layout()["positions"], {
+            "p1": "72.00,36.00!",
+            'store "a"': "180.00,90.00!"
+        })
+    
+    def test_second_render_reuses_layout(self):
+        """Test that an unchanged graph is drawn from its pinned positions."""
+        self._render()
+        calls = self._render()
+        
+        self.assertEqual(len(calls), 1)
+        format, kwargs, source = calls[0]
+        self.assertEqual(format, 'svg')
+        self.assertEqual(kwargs, {'engine': 'neato', 'neato_no_op': 2})
+        self.assertIn('"p1" [pos="72.00,36.00!"]', source)
+        self.assertIn('"store \\"a\\"" [pos="180.00,90.00!"]', source)
+    
+    def test_other_engine_does_not_reuse_layout(self):
+        """Test that a layout cached for one engine is not used by another."""
+        self._render(engine='dot')
+        calls = self._render(engine='sfdp')
+        
+        self.assertEqual([(format, kwargs) for format, kwargs, _ in calls],
+                         [('svg', {}), ('plain', {})])
+    
+    def test_changed_graph_does_not_reuse_layout(self):
+        """Test that a layout is not used once the graph source changes."""
+        self._render()
+        self.diagram.create_data_flow(source_id='store "a"', target_id="p1", name="Read")
+        calls = self._render()
+        
+        self.assertEqual([(format, kwargs) for format, kwargs, _ in calls],
+                         [('svg', {}), ('plain', {})])
+    
+    def test_invalid_layout_file_is_replaced(self):
+        """Test that an unreadable sidecar is ignored and written again."""
+        with open(self.layout_path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        
+        calls = self._render()
+        
+        self.assertEqual([(format, kwargs) for format, kwargs, _ in calls],
+                         [('svg', {}), ('plain', {})])
+        self.assertIn("p1", self._load_layout()["positions"])
+
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
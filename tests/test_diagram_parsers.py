@@ -2,8 +2,10 @@
 Tests for the diagram parsers (Mermaid and PlantUML).
 """
 
+import base64
 import os
 import tempfile
+import zlib
 from pathlib import Path
 
 import pytest
@@ -11,6 +13,7 @@ import pytest
 from pydiagrams.parsers.base_parser import BaseParser
 from pydiagrams.parsers.mermaid_parser import MermaidParser
 from pydiagrams.parsers.plantuml_parser import PlantUMLParser
+from pydiagrams.parsers.plantuml_encoding import encode_plantuml
 from pydiagrams.parsers.diagram_utils import (
     detect_diagram_file_type,
     parse_diagram_file,
@@ -122,6 +125,35 @@ class TestPlantUMLParser:
         assert data["type"] == "class"
 
 
+class TestPlantUMLEncoding:
+    """Tests for the PlantUML server text encoding."""
+
+    @staticmethod
+    def _decode(encoded):
+        """Decode PlantUML's base64 alphabet and inflate the raw DEFLATE data."""
+        standard = encoded.translate(str.maketrans(
+            "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_",
+            "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+        ))
+        return zlib.decompress(base64.b64decode(standard + "=" * (-len(standard) % 4)), -15)
+
+    def test_round_trip(self):
+        """Test that encoded sources of every padding length decode back."""
+        for length in range(3):
+            content = "@startuml\nAlice -> Bob : h\u00e9llo" + "!" * length + "\n@enduml"
+            encoded = encode_plantuml(content)
+            
+            assert not encoded.startswith("~")
+            assert "=" not in encoded
+            assert self._decode(encoded) == content.encode("utf-8")
+
+    def test_bytes_match_text(self):
+        """Test that UTF-8 bytes and text encode identically."""
+        content = "@startuml\nAlice -> Bob : hello\n@enduml"
+        
+        assert encode_plantuml(content.encode("utf-8")) == encode_plantuml(content)
+
+
 class TestDiagramUtils:
     """Tests for the diagram utility functions."""
 
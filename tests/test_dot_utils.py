@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Tests for the DOT source helpers.
+
+This module contains unit tests for quoting and attribute formatting.
+"""
+
+import unittest
+
+from graphviz.quoting import ESCAPE_UNESCAPED_QUOTES
+
+from pydiagrams.renderers.dot_utils import dot_attr_list, dot_quote
+
+
+class TestDotQuote(unittest.TestCase):
+    """Test case for DOT quoting."""
+    
+    def test_quote_plain_values(self):
+        """Test that values are double-quoted with line breaks kept."""
+        self.assertEqual(dot_quote("Orders"), '"Orders"')
+        self.assertEqual(dot_quote("Name\\nDescription"), '"Name\\nDescription"')
+        self.assertEqual(dot_quote(8), '"8"')
+    
+    def test_escape_quotes_like_graphviz(self):
+        """Test that quotes are escaped once, matching graphviz."""
+        for value in ('a"b', 'a\\"b', 'a\\\\"b', 'a\\\\\\"b', '"', '\\"'):
+            self.assertEqual(dot_quote(value), f'"{ESCAPE_UNESCAPED_QUOTES(value)}"', value)
+        self.assertEqual(dot_quote('say \\"hi\\"'), '"say \\"hi\\""')
+    
+    def test_attr_list(self):
+        """Test that attributes are sorted by name and quoted."""
+        self.assertEqual(
+            dot_attr_list({"shape": "box", "label": 'a"b'}),
+            'label="a\\"b" shape="box"'
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
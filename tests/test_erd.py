@@ -4,6 +4,7 @@ Tests for the Entity Relationship Diagram implementation.
 
 import os
 import sys
+import tempfile
 import unittest
 
 # Add the parent directory to the sys.path for imports
@@ -18,6 +19,7 @@ from pydiagrams.diagrams.entity.erd import (
     RelationshipType,
     Cardinality
 )
+from pydiagrams.renderers.erd_renderer import ERDRenderer
 
 
 class TestEntityRelationshipDiagram(unittest.TestCase):
@@ -299,5 +301,48 @@ class TestEntityRelationshipDiagram(unittest.TestCase):
         self.assertEqual(relationship.target_role, "child")
 
 
+class TestERDRenderer(unittest.TestCase):
+    """Test cases for the ERDRenderer class."""
+    
+    def test_render_dot_source(self):
+        """Test that the 'dot' format writes the DOT source without Graphviz."""
+        diagram = EntityRelationshipDiagram(name="Test ERD")
+        customer = diagram.create_entity(name="Customer")
+        order = diagram.create_entity(name="Order")
+        diagram.create_relationship(
+            source_entity_id=customer.id,
+            target_entity_id=order.id,
+            name="places"
+        )
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = ERDRenderer(diagram).render(
+                os.path.join(tmp_dir, "erd.svg"), format="dot"
+            )
+            
+            self.assertEqual(output_path, os.path.join(tmp_dir, "erd.dot"))
+            with open(output_path, "r", encoding="utf-8") as f:
+                source = f.read()
+            self.assertIn('digraph "Test ERD"', source)
+            self.assertIn(f'"{customer.id}" -> "{order.id}"', source)
+            self.assertIn('label="places"', source)
+    
+    def test_render_recreates_removed_output_directory(self):
+        """Test that an output directory removed after a render is created again."""
+        diagram = EntityRelationshipDiagram(name="Test ERD")
+        diagram.create_entity(name="Customer")
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_dir = os.path.join(tmp_dir, "out")
+            output_path = ERDRenderer(diagram).render(
+                os.path.join(output_dir, "erd.svg"), format="dot"
+            )
+            
+            os.unlink(output_path)
+            os.rmdir(output_dir)
+            ERDRenderer(diagram).render(os.path.join(output_dir, "erd.svg"), format="dot")
+            self.assertTrue(os.path.exists(output_path))
+
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
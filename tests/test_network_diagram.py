@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for Network Diagram rendering.
+
+This module contains unit tests for the Network Diagram renderer.
+"""
+
+import unittest
+import os
+import tempfile
+
+from pydiagrams.diagrams.architectural.network_diagram import (
+    NetworkDiagram, NetworkDevice, NetworkConnection, NetworkZone,
+    DeviceType, ConnectionType
+)
+from pydiagrams.renderers.network_renderer import NetworkDiagramRenderer
+
+
+class TestNetworkDiagramRenderer(unittest.TestCase):
+    """Test case for the Network Diagram renderer."""
+    
+    def setUp(self):
+        """Set up test cases."""
+        self.diagram = NetworkDiagram(
+            name="Test Network Diagram",
+            description="Test description"
+        )
+        zone = NetworkZone(name="DMZ & Edge", zone_type="dmz", cidr="10.0.0.0/24")
+        self.diagram.add_zone(zone)
+        router = NetworkDevice(name="Edge <Router>", device_type=DeviceType.ROUTER,
+                               ip_address="10.0.0.1", zone_id=zone.id)
+        server = NetworkDevice(name="Web Server", zone_id=zone.id)
+        self.diagram.add_device(router)
+        self.diagram.add_device(server)
+        self.diagram.add_connection(NetworkConnection(
+            source_id=router.id, target_id=server.id,
+            connection_type=ConnectionType.WIRELESS, bandwidth="1 Gbps",
+            protocol="HTTPS", is_bidirectional=False
+        ))
+    
+    def _render(self, renderer):
+        """Render the test diagram and return the SVG content."""
+        with tempfile.NamedTemporaryFile(suffix=".svg", delete=False) as tmp:
+            tmp_path = tmp.name
+        
+        try:
+            output_path = renderer.render(self.diagram, tmp_path)
+            self.assertTrue(os.path.exists(output_path))
+            with open(output_path, "r", encoding="utf-8") as f:
+                return f.read()
+        finally:
+            # Clean up the temporary file
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    
+    def test_render_diagram(self):
+        """Test rendering a network diagram as text."""
+        svg_content = self._render(NetworkDiagramRenderer())
+        
+        self.assertIn("<svg", svg_content)
+        self.assertIn("Edge &lt;Router&gt;", svg_content)
+        self.assertIn("DMZ &amp; Edge", svg_content)
+        self.assertIn('marker-end="url(#arrow)"', svg_content)
+        self.assertIn('stroke-dasharray="5,3"', svg_content)
+        self.assertIn("HTTPS", svg_content)
+    
+    def test_render_diagram_with_svgwrite(self):
+        """Test that the svgwrite fallback renders the same elements."""
+        text_content = self._render(NetworkDiagramRenderer())
+        svgwrite_content = self._render(NetworkDiagramRenderer(use_text_mode=False))
+        
+        for tag in ("<g ", "<rect ", "<line ", "<text ", "<tspan ", "<symbol "):
+            self.assertEqual(text_content.count(tag), svgwrite_content.count(tag), tag)
+        self.assertIn("Edge &lt;Router&gt;", svgwrite_content)
+    
+    def test_text_mode_defs_match_svgwrite(self):
+        """Test that the prebuilt definitions match the svgwrite definitions."""
+        text_content = self._render(NetworkDiagramRenderer())
+        svgwrite_content = self._render(NetworkDiagramRenderer(use_text_mode=False))
+        
+        def defs(svg_content):
+            return svg_content[svg_content.index("<defs>"):svg_content.index("</defs>")]
+        
+        self.assertEqual(defs(text_content), defs(svgwrite_content))
+    
+    def test_render_raster(self):
+        """Test rendering a network diagram directly to PNG."""
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
+            tmp_path = tmp.name
+        
+        try:
+            renderer = NetworkDiagramRenderer(width=400, height=300)
+            output_path = renderer.render_raster(self.diagram, tmp_path)
+            
+            with open(output_path, "rb") as f:
+                header = f.read(24)
+            self.assertTrue(header.startswith(b"\x89PNG\r\n\x1a\n"))
+            # The IHDR chunk holds the image width and height
+            self.assertEqual(int.from_bytes(header[16:20], "big"), 400)
+            self.assertEqual(int.from_bytes(header[20:24], "big"), 300)
+        finally:
+            # Clean up the temporary file
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+
+if __name__ == "__main__":
+    unittest.main()